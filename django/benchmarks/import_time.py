@@ -0,0 +1,99 @@
+"""
+Measure the time taken to import the template tags and urls of
+django_vite_plugin once Django is set up, with `python -X importtime`
+
+Importing them must not load the manifest, a synthetic 10k-entry one is
+built so that loading it at import time shows up in the measure.
+
+    python benchmarks/import_time.py [--threshold MS] [--runs N]
+
+Exits with 1 if the fastest run exceeds the threshold.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict
+
+from synthetic import make_manifest
+
+SRC_DIR = Path(__file__).resolve().parent.parent / 'src'
+
+MODULES = ('django_vite_plugin.templatetags.vite', 'django_vite_plugin.urls')
+
+MARKER = 'django_vite_plugin.benchmark.imports'
+
+# Run in a new interpreter, `-X importtime` reports every import of it
+CHILD = '''
+import sys
+from pathlib import Path
+import django
+from django.conf import settings
+
+base_dir = Path(sys.argv[1])
+settings.configure(
+    BASE_DIR=base_dir,
+    DEBUG=False,
+    INSTALLED_APPS=['django.contrib.staticfiles', 'django_vite_plugin'],
+    STATIC_URL='/static/',
+    DJANGO_VITE_PLUGIN={'BUILD_DIR': base_dir / 'build', 'DEV_MODE': False},
+)
+django.setup()
+sys.stderr.write('import time: %(marker)s\\n')
+
+%(imports)s
+
+from django_vite_plugin import utils
+assert utils.COMPILED_MANIFEST is None, 'the manifest was loaded at import time'
+''' % {'marker': MARKER, 'imports': '\n'.join(f'import {module}' for module in MODULES)}
+
+
+def measure(base_dir: str) -> Dict[str, int]:
+    """Get the cumulative time of each import of the plugin after setup, in us."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(SRC_DIR), os.environ.get('PYTHONPATH')])))
+    env.pop('DJANGO_SETTINGS_MODULE', None)
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', CHILD, base_dir],
+        env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        sys.exit(result.stderr.splitlines()[-1])
+
+    times: Dict[str, int] = {}
+    lines = result.stderr.splitlines()
+    for line in lines[lines.index(f'import time: {MARKER}') + 1:]:
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Nested imports are indented, their time is in their parent's
+        if name.startswith(' django_vite_plugin'):
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--threshold', type=float, default=50, help='maximum import time in ms (default: 50)')
+    parser.add_argument('--runs', type=int, default=5, help='number of runs, the fastest is kept (default: 5)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as base_dir:
+        manifest = Path(base_dir) / 'build' / '.vite' / 'manifest.json'
+        manifest.parent.mkdir(parents=True)
+        manifest.write_text(json.dumps(make_manifest()))
+        runs = [measure(base_dir) for _ in range(args.runs)]
+
+    best = min(runs, key=lambda times: sum(times.values()))
+    for name, time in sorted(best.items(), key=lambda item: -item[1]):
+        print(f'{time / 1000:8.2f} ms  {name}')
+    total = sum(best.values()) / 1000
+    print(f'{total:8.2f} ms  total (threshold: {args.threshold:g} ms)')
+    if total > args.threshold:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""
+Compare the memory kept by a synthetic Vite manifest parsed as dicts with
+the memory kept by the same manifest in a `ManifestStore`, with tracemalloc
+
+    python benchmarks/manifest_memory.py [--size N]
+
+Exits with 1 if the store is not smaller than the dicts.
+"""
+import argparse
+import gc
+import json
+import sys
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Tuple
+
+from synthetic import make_manifest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from django_vite_plugin.store import ManifestStore  # noqa: E402
+
+
+def measure(load: Callable[[], Any]) -> Tuple[int, int]:
+    """Get the bytes still allocated by `load` once it returned and its peak."""
+    gc.collect()
+    tracemalloc.start()
+    result = load()
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--size', type=int, default=10000, help='number of chunks (default: 10000)')
+    args = parser.parse_args()
+
+    # Parsed from the text, like `manifest.json`, so no string is shared
+    # with the generator
+    text = json.dumps(make_manifest(args.size))
+    dicts, dicts_peak = measure(lambda: json.loads(text))
+    store, store_peak = measure(lambda: ManifestStore.from_manifest(json.loads(text)))
+
+    print(f'{args.size} chunks, {len(text) / 1e6:.2f} MB of JSON')
+    print(f'dicts: {dicts / 1e6:6.2f} MB kept, {dicts_peak / 1e6:6.2f} MB peak')
+    print(f'store: {store / 1e6:6.2f} MB kept, {store_peak / 1e6:6.2f} MB peak')
+    if store >= dicts:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,37 @@
+import random
+from typing import Any, Dict
+
+
+def make_manifest(size: int = 10000, seed: int = 0) -> Dict[str, Any]:
+    """
+    Make a Vite manifest with `size` chunks, 60% of them entries and the
+    rest chunks shared between them, each importing up to 5 shared chunks
+    """
+    rng = random.Random(seed)
+    entries = size * 6 // 10
+    shared = [f'_shared-{i}.js' for i in range(size - entries)]
+    manifest: Dict[str, Any] = {}
+
+    for i, key in enumerate(shared):
+        chunk: Dict[str, Any] = {'file': f'assets/shared-{i}.js'}
+        imports = rng.sample(shared[:i], min(i, rng.randint(0, 5)))
+        if imports:
+            chunk['imports'] = imports
+        manifest[key] = chunk
+
+    for i in range(entries):
+        src = f'app/pages/page-{i}.js'
+        chunk = {
+            'file': f'assets/page-{i}.js',
+            'src': src,
+            'name': f'page-{i}',
+            'isEntry': True,
+        }
+        imports = rng.sample(shared, rng.randint(0, 5))
+        if imports:
+            chunk['imports'] = imports
+        if i % 3 == 0:
+            chunk['css'] = [f'assets/page-{i}.css']
+        manifest[src] = chunk
+
+    return manifest
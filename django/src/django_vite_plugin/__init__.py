@@ -0,0 +1,16 @@
+def warmup() -> None:
+    """
+    Load the manifest and compile every template using `{% vite %}`
+    Call it before forking the workers so that they share the warm caches
+    """
+    from .utils import warmup
+    warmup()
+
+
+def get_bundle(entries, attrs=None):
+    """
+    Get the stylesheets, modulepreload links and entry scripts of Vite
+    entries as a `django_vite_plugin.bundle.Bundle`
+    """
+    from .bundle import get_bundle
+    return get_bundle(entries, attrs)
@@ -0,0 +1,35 @@
+import os
+import sys
+from django.apps import AppConfig
+
+
+class DjangoVitePluginConfig(AppConfig):
+    name = 'django_vite_plugin'
+
+    def ready(self) -> None:
+        """
+        Warm up the caches when serving if `WARMUP` is enabled and record
+        the templates of each page in development for the Vite reloader
+        """
+        from .config_helper import get_config
+        config = get_config()
+        if config['DEV_MODE'] and config['TEMPLATE_REGISTRY']:
+            from .template_registry import install
+            install()
+        # Management commands, like the ones Vite runs before the manifest
+        # exists, serve no requests
+        if config['WARMUP'] and not is_management_command():
+            from .utils import warmup
+            try:
+                warmup()
+            except Exception as error:
+                sys.stderr.write(f"Cannot warm up django_vite_plugin: {error}\n")
+
+
+def is_management_command() -> bool:
+    """Check if Django was started by `manage.py`, `django-admin` or `python -m django`."""
+    program = sys.argv[0] if sys.argv else ''
+    return (
+        os.path.basename(program) in ('manage.py', 'django-admin', 'django-admin.py')
+        or program.endswith(os.path.join('django', '__main__.py'))
+    )
@@ -0,0 +1,137 @@
+from typing import Any, Dict, Iterable, Tuple, Union
+from urllib.parse import urljoin
+from .cache import RENDER_CACHE
+from .compiler import CompiledManifest
+from .constants import CSS_EXTENSIONS
+from .html import get_html
+from .utils import (
+    CONFIG,
+    find_asset,
+    get_compiled_manifest,
+    get_dev_server,
+    get_html_dev,
+)
+from .templatetags.utils import get_attrs_key, make_template_attrs
+
+
+class Bundle:
+    """
+    Assets of a group of Vite entries
+    The stylesheets and modulepreload links belong in the `<head>`, the
+    entry scripts may come anywhere after them
+    """
+
+    __slots__ = (
+        'css', 'preloads', 'scripts', 'head_parts', 'script_parts',
+        'head_html', 'scripts_html', 'html'
+    )
+
+    def __init__(
+        self,
+        css: Dict[str, str],
+        preloads: Dict[str, str],
+        scripts: Dict[Union[str, None], str],
+        has_preload: bool
+    ):
+        # URLs of the stylesheets, in the order they must be loaded
+        self.css: Tuple[str, ...] = tuple(css)
+        # URLs of the JS chunks imported by the entries
+        self.preloads: Tuple[str, ...] = tuple(url for url in preloads if url not in scripts)
+        # URLs of the entry scripts, the React preamble has none
+        self.scripts: Tuple[str, ...] = tuple(url for url in scripts if url is not None)
+        # Tags of the stylesheets and modulepreload links, then of the scripts
+        self.head_parts: Tuple[str, ...] = tuple(css.values())
+        if has_preload:
+            self.head_parts += tuple(preloads[url] for url in self.preloads)
+        self.script_parts: Tuple[str, ...] = tuple(scripts.values())
+        self.head_html = ''.join(self.head_parts)
+        self.scripts_html = ''.join(self.script_parts)
+        self.html = self.head_html + self.scripts_html
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the URLs of the bundle, e.g. for a JSON response."""
+        return {
+            'css': list(self.css),
+            'preloads': list(self.preloads),
+            'scripts': list(self.scripts),
+        }
+
+
+def get_bundle(
+    entries: Union[str, Iterable[str]],
+    attrs: Union[Dict[str, Any], None] = None
+) -> Bundle:
+    """
+    Get the assets of Vite entries, with the same attributes as the tag
+    Bundles are cached with the renders of `{% vite %}` using variables
+    """
+    entries = (entries,) if isinstance(entries, str) else tuple(entries)
+    attributes = dict(attrs) if attrs else {}
+
+    manifest = get_compiled_manifest()
+    key = ('bundle', entries, get_attrs_key(attributes))
+    try:
+        cached = RENDER_CACHE.get(key)
+    except TypeError:
+        # An attribute value that cannot be a key
+        key = cached = None
+    if cached is not None and cached[0] is manifest:
+        return cached[1]
+
+    paths = tuple(find_asset(entry) for entry in entries if entry)
+    tag_attrs = make_template_attrs(attributes)
+    if CONFIG['DEV_MODE']:
+        bundle = make_dev_bundle(paths, tag_attrs)
+    else:
+        bundle = make_bundle(manifest, paths, tag_attrs)
+    if key is not None:
+        RENDER_CACHE.set(key, (manifest, bundle))
+    return bundle
+
+
+def make_bundle(manifest: CompiledManifest, paths: Tuple[str, ...], attrs: Dict[str, str]) -> Bundle:
+    """Make the bundle of found entries from the compiled manifest."""
+    css: Dict[str, str] = {}
+    preloads: Dict[str, str] = {}
+    scripts: Dict[str, str] = {}
+    preload_attrs = attrs['preload']
+    url_prefix = manifest.url_prefix
+
+    for path in paths:
+        if path == 'react':
+            continue
+        entry = manifest.get_entry(path)
+        # The tags come from the same caches as the tag, in the same order
+        css_files = manifest.graph.css(path)
+        for file, tag in zip(css_files, manifest.get_css_parts(path)):
+            css.setdefault(urljoin(url_prefix, file), tag)
+
+        imports = manifest.graph.imports(path)
+        if preload_attrs is not None:
+            preload_tags = manifest.get_preload_parts(path, preload_attrs)
+        else:
+            preload_tags = ('',) * len(imports)
+        for file, tag in zip(imports, preload_tags):
+            preloads.setdefault(urljoin(url_prefix, file), tag)
+
+        url = urljoin(url_prefix, entry.file)
+        target = css if entry.file.endswith('.css') else scripts
+        target.setdefault(url, get_html(url, attrs))
+
+    return Bundle(css, preloads, scripts, preload_attrs is not None)
+
+
+def make_dev_bundle(paths: Tuple[str, ...], attrs: Dict[str, str]) -> Bundle:
+    """Make the bundle of found entries served by the dev server, with its client."""
+    dev_server = get_dev_server()
+    css: Dict[str, str] = {}
+    scripts: Dict[Union[str, None], str] = {}
+
+    for path in (CONFIG['WS_CLIENT'],) + paths:
+        if path == 'react':
+            scripts.setdefault(None, get_html_dev(path, attrs))
+            continue
+        target = css if path.endswith(tuple(CSS_EXTENSIONS)) else scripts
+        target.setdefault(f'{dev_server}/{path}', get_html_dev(path, attrs))
+
+    return Bundle(css, {}, scripts, False)
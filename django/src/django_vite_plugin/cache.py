@@ -1,24 +1,80 @@
-from typing import Dict, Any, Union
-from functools import lru_cache
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Tuple, Union
 
-# Cache for previously searched files
-FOUND_FILES_CACHE: Dict[str, str] = {}
 
-# Cache for manifest data
-VITE_MANIFEST: Dict[str, Any] = {}
+class LRUCache:
+    """Thread-safe, size bounded cache evicting the least recently used keys."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a cached value, counting the hit or the miss."""
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Cache a value, evicting the oldest ones above `maxsize`."""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def items(self) -> List[Tuple[Hashable, Any]]:
+        """Get the cached items, least recently used first, without counting them."""
+        with self._lock:
+            return list(self._data.items())
+
+    def clear(self) -> None:
+        """Remove every value and reset the counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Get the size and the counters of the cache."""
+        return {
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+
+# Cache for previously searched files, including the ones not found
+FOUND_FILES_CACHE = LRUCache(1024)
+
+# Tags of the nodes using variables keyed by their resolved assets and attributes
+RENDER_CACHE = LRUCache(1024)
 
 # Cache for dev server URL
 DEV_SERVER: Union[str, None] = None
 
-@lru_cache(maxsize=128)
-def get_cached_manifest(manifest_path: str) -> Dict[str, Any]:
-    """Cache and return the manifest data."""
-    return VITE_MANIFEST.get(manifest_path, {})
-
 def clear_caches() -> None:
     """Clear all caches."""
     FOUND_FILES_CACHE.clear()
-    VITE_MANIFEST.clear()
+    RENDER_CACHE.clear()
     global DEV_SERVER
     DEV_SERVER = None
-    get_cached_manifest.cache_clear() 
\ No newline at end of file
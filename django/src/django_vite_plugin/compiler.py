@@ -0,0 +1,222 @@
+import marshal
+import os
+from pathlib import Path
+from typing import Dict, Any, Tuple, Union
+from urllib.parse import urljoin
+from .graph import ManifestGraph
+from .store import ManifestChunk, ManifestStore
+from .html import get_html
+
+# Bumped whenever the layout of the compiled manifest file changes
+COMPILED_FORMAT = 5
+
+
+class CompiledManifest:
+    """Vite manifest with the HTML of its entries rendered ahead of time."""
+
+    def __init__(self, store: ManifestStore, url_prefix: str, css_attrs: str):
+        self.store = store
+        self.graph = ManifestGraph(store)
+        self.url_prefix = url_prefix
+        # Signature and content hash of the manifest file this was compiled from
+        self.signature = None
+        self.source_hash = None
+        self.css_attrs = {'css': css_attrs}
+        # (js, css, preload) attributes of the tags that specify none, the
+        # only ones kept here, the renders of the others are cached by the
+        # callers in bounded caches
+        self.default_attrs: Tuple[str, str, Union[str, None]] = None
+        # Stylesheet links of an entry, they never depend on the tag attributes
+        self.css_parts: Dict[str, Tuple[str, ...]] = {}
+        # Modulepreload links of an entry with the default attributes
+        self.preload_parts: Dict[str, Tuple[str, ...]] = {}
+        # Values of the `Link` headers preloading an entry, or a group of them
+        self.entry_links: Dict[Tuple[str, str, str], Tuple[str, ...]] = {}
+        self.links: Dict[Tuple[Tuple[str, ...], str, str], Tuple[str, ...]] = {}
+        # Tags of the entries with the default attributes, by path
+        self.fragments: Dict[str, Tuple[str, ...]] = {}
+
+    def compile(self, attrs: Dict[str, str]) -> None:
+        """Render every entry point of the manifest with the default attributes."""
+        self.default_attrs = get_attrs_signature(attrs)
+        for chunk in self.store.chunks:
+            if chunk.is_entry:
+                self.render_parts(chunk.key, attrs)
+
+    def render_parts(self, path: str, attrs: Dict[str, str]) -> Tuple[str, ...]:
+        """
+        Get the tags of an entry, one per file
+        They are kept for the default attributes only
+        """
+        is_default = get_attrs_signature(attrs) == self.default_attrs
+        if is_default:
+            parts = self.fragments.get(path)
+            if parts is not None:
+                return parts
+
+        entry = self.get_entry(path)
+        preload = attrs.get('preload')
+        parts = self.get_css_parts(path)
+        if preload is not None:
+            parts += self.get_preload_parts(path, preload)
+        parts += (get_html(urljoin(self.url_prefix, entry.file), attrs),)
+        if is_default:
+            self.fragments[path] = parts
+        return parts
+
+    def get_entry(self, path: str) -> ManifestChunk:
+        """Get a manifest entry by path."""
+        entry = self.store.get(path)
+        if entry is None:
+            raise RuntimeError(f"Cannot find {path} in Vite manifest")
+        return entry
+
+    def get_css_parts(self, path: str) -> Tuple[str, ...]:
+        """Get the stylesheet links required by an entry."""
+        parts = self.css_parts.get(path)
+        if parts is None:
+            parts = self.css_parts[path] = tuple(
+                get_html(urljoin(self.url_prefix, css_path), self.css_attrs)
+                for css_path in self.graph.css(path)
+            )
+        return parts
+
+    def get_preload_parts(self, path: str, preload_attrs: str) -> Tuple[str, ...]:
+        """
+        Get the modulepreload links of the JS chunks imported by an entry
+        They are kept for the default attributes only
+        """
+        is_default = self.default_attrs is not None and preload_attrs == self.default_attrs[2]
+        parts = self.preload_parts.get(path) if is_default else None
+        if parts is None:
+            parts = tuple(
+                f'<link {preload_attrs} href="{urljoin(self.url_prefix, file)}" />'
+                for file in self.graph.imports(path)
+            )
+            if is_default:
+                self.preload_parts[path] = parts
+        return parts
+
+    def get_entry_links(self, path: str, style_params: str = '', script_params: str = '') -> Tuple[str, ...]:
+        """
+        Get the values of the `Link` headers preloading an entry
+        The params, e.g. `; crossorigin`, give the preloads the CORS mode of
+        the tags using them, they are not reused otherwise
+        """
+        key = (path, style_params, script_params)
+        links = self.entry_links.get(key)
+        if links is None:
+            entry = self.get_entry(path)
+            links = [
+                f'<{urljoin(self.url_prefix, css_path)}>; rel=preload; as=style{style_params}'
+                for css_path in self.graph.css(path)
+            ]
+            if entry.file.endswith('.css'):
+                links.append(f'<{urljoin(self.url_prefix, entry.file)}>; rel=preload; as=style{style_params}')
+            else:
+                links += [
+                    f'<{urljoin(self.url_prefix, file)}>; rel=modulepreload{script_params}'
+                    for file in self.graph.imports(path) + (entry.file,)
+                ]
+            links = self.entry_links[key] = tuple(links)
+        return links
+
+    def get_links(self, paths: Tuple[str, ...], style_params: str = '', script_params: str = '') -> Tuple[str, ...]:
+        """Get the values of the `Link` headers preloading a group of entries."""
+        key = (paths, style_params, script_params)
+        links = self.links.get(key)
+        if links is None:
+            found: Dict[str, None] = {}
+            for path in paths:
+                found.update(dict.fromkeys(self.get_entry_links(path, style_params, script_params)))
+            links = self.links[key] = tuple(found)
+        return links
+
+    def to_data(self) -> Dict[str, Any]:
+        """Get the compiled state as plain data with every closure resolved."""
+        return {
+            'format': COMPILED_FORMAT,
+            'source_hash': self.source_hash,
+            'url_prefix': self.url_prefix,
+            'css_attrs': self.css_attrs['css'],
+            'default_attrs': self.default_attrs,
+            'store': self.store.to_data(),
+            'closures': self.graph.closures(),
+            'cycles': self.graph.cycles,
+            'css_parts': self.css_parts,
+            'preload_parts': self.preload_parts,
+            'fragments': self.fragments,
+        }
+
+    @classmethod
+    def from_data(cls, data: Dict[str, Any]) -> 'CompiledManifest':
+        """Restore a compiled manifest from the output of `to_data`."""
+        compiled = cls(ManifestStore.from_data(data['store']), data['url_prefix'], data['css_attrs'])
+        compiled.graph = ManifestGraph(compiled.store, data['closures'], data['cycles'])
+        compiled.source_hash = data['source_hash']
+        compiled.default_attrs = data['default_attrs']
+        compiled.css_parts = data['css_parts']
+        compiled.preload_parts = data['preload_parts']
+        compiled.fragments = data['fragments']
+        return compiled
+
+
+def get_attrs_signature(attrs: Dict[str, str]) -> Tuple[str, str, Union[str, None]]:
+    """Get the (js, css, preload) attributes the tags of an entry depend on."""
+    return (attrs['js'], attrs['css'], attrs.get('preload'))
+
+
+def get_compiled_path(manifest_path: Path) -> Path:
+    """Get the path of the compiled manifest, next to the manifest itself."""
+    return Path(manifest_path).with_name('manifest.compiled')
+
+
+def save_compiled_manifest(compiled: CompiledManifest, path: Path) -> None:
+    """Write a compiled manifest to a file, replacing the old one at once."""
+    data = compiled.to_data()
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as compiled_file:
+        marshal.dump(data, compiled_file)
+    os.replace(tmp_path, path)
+
+
+def load_compiled_manifest(
+    path: Path,
+    source_hash: str,
+    url_prefix: str,
+    css_attrs: str,
+    attrs: Dict[str, str]
+) -> Union[CompiledManifest, None]:
+    """
+    Load a compiled manifest
+    Returns None if it does not exist or was compiled from another
+    manifest or configuration
+    """
+    try:
+        with open(path, 'rb') as compiled_file:
+            data = marshal.load(compiled_file)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+    if (
+        not isinstance(data, dict)
+        or data.get('format') != COMPILED_FORMAT
+        or data.get('source_hash') != source_hash
+        or data.get('url_prefix') != url_prefix
+        or data.get('css_attrs') != css_attrs
+        or data.get('default_attrs') != get_attrs_signature(attrs)
+    ):
+        return None
+    return CompiledManifest.from_data(data)
+
+
+def compile_manifest(
+    manifest: Dict[str, Any],
+    url_prefix: str,
+    css_attrs: str,
+    attrs: Dict[str, str]
+) -> CompiledManifest:
+    """Compile a manifest, rendering its entries with the default attributes."""
+    compiled = CompiledManifest(ManifestStore.from_manifest(manifest), url_prefix, css_attrs)
+    compiled.compile(attrs)
+    return compiled
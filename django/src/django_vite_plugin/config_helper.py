@@ -1,11 +1,29 @@
+import threading
 from pathlib import Path
 from typing import Dict, Any, Union
 from django.conf import settings
 from .constants import DEFAULT_CONFIG
 
+# Configuration merged on the first call of `get_config`
+CONFIG: Union[Dict[str, Any], None] = None
+
+CONFIG_LOCK = threading.Lock()
+
 
 def get_config() -> Dict[str, Any]:
-    """Get and merge configuration with defaults."""
+    """
+    Get the configuration merged with the defaults
+    It is computed once and shared, copy it before modifying
+    """
+    global CONFIG
+    if CONFIG is None:
+        with CONFIG_LOCK:
+            if CONFIG is None:
+                CONFIG = _make_config()
+    return CONFIG
+
+
+def _make_config() -> Dict[str, Any]:
     config = getattr(settings, 'DJANGO_VITE_PLUGIN', None)
     config = _deep_copy(config, DEFAULT_CONFIG)
     
@@ -21,7 +39,19 @@ def get_config() -> Dict[str, Any]:
         config['HOT_FILE'] = str(getattr(settings, 'BASE_DIR') / '.hotfile')
     elif isinstance(config['HOT_FILE'], Path):
         config['HOT_FILE'] = str(config['HOT_FILE'])
-    
+
+    # Handle cache directory path
+    if isinstance(config['CACHE_DIR'], str):
+        config['CACHE_DIR'] = Path(config['CACHE_DIR'])
+
+    # Ensure BUILD_URL_PREFIX ends with '/'
+    if not config['BUILD_URL_PREFIX'].endswith('/'):
+        config['BUILD_URL_PREFIX'] += '/'
+
+    # Set JS attributes for build mode
+    if config['DEV_MODE'] is False and 'JS_ATTRS_BUILD' in config:
+        config['JS_ATTRS'] = config['JS_ATTRS_BUILD']
+
     return config
 
 def _deep_copy(config: Union[Dict[str, Any], None], default: Dict[str, Any]) -> Dict[str, Any]:
@@ -0,0 +1,54 @@
+import django
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+from .config_helper import get_config
+from .fingerprint import get_settings_files, make_fingerprint, write_artifact
+from .scanner import get_template_files
+
+# Bumped whenever the layout of the snapshot file changes
+SNAPSHOT_FORMAT = 1
+
+
+def get_snapshot_path() -> Path:
+    """Get the path of the file the configuration for Vite is written to."""
+    return Path(get_config()['CACHE_DIR']) / 'config.json'
+
+
+def get_entries_path() -> Path:
+    """Get the path of the file the entries used by the templates are written to."""
+    return Path(get_config()['CACHE_DIR']) / 'entries.json'
+
+
+def get_config_files(app_paths: Iterable[str]) -> List[str]:
+    """
+    Get the files the configuration sent to the Vite plugin depends on: the
+    settings modules, the installed apps and this package
+    """
+    return get_settings_files() + list(app_paths) + [django.__file__, __file__]
+
+
+def write_config_snapshot(config: Dict[str, Any], app_paths: Iterable[str]) -> Path:
+    """Write the configuration sent to the Vite plugin along with the files it depends on."""
+    files = get_config_files(app_paths)
+    path = get_snapshot_path()
+    write_artifact(path, {
+        'format': SNAPSHOT_FORMAT,
+        'fingerprint': make_fingerprint(files),
+        'config': config,
+    })
+    return path
+
+
+def write_entries_snapshot(entries: List[str]) -> Path:
+    """
+    Write the entries used by the templates along with the files they
+    were found in: the settings modules and every template and directory
+    """
+    files = get_settings_files() + get_template_files()
+    path = get_entries_path()
+    write_artifact(path, {
+        'format': SNAPSHOT_FORMAT,
+        'fingerprint': make_fingerprint(files),
+        'entries': entries,
+    })
+    return path
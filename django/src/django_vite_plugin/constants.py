@@ -16,6 +16,15 @@ DEFAULT_CONFIG = {
         'type': 'text/css'
     },
     'STATIC_LOOKUP': True,
+    'STATIC_LOOKUP_CACHE_SIZE': 1024,
+    'STATIC_INDEX': False,
+    'RENDER_CACHE_SIZE': 1024,
+    'CACHE_DIR': getattr(settings, 'BASE_DIR') / '.django_vite_plugin',
+    'MODULE_PRELOAD': False,
+    'DEDUPLICATE': True,
+    'MANIFEST_WATCH_INTERVAL': None,
+    'WARMUP': False,
+    'TEMPLATE_REGISTRY': False,
 }
 
 # File extensions
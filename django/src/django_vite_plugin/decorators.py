@@ -0,0 +1,31 @@
+import asyncio
+import functools
+from typing import Callable
+
+
+def vite_entries(*entries: str) -> Callable:
+    """
+    Declare the Vite entries rendered by a view
+    Their assets are preloaded by `ViteLinkHeaderMiddleware` and
+    `EarlyHintsMiddleware` while the view is still running
+
+        @vite_entries('myapp/js/main.js')
+        def home(request):
+            ...
+
+    It may also wrap the view in the URL patterns, the view itself is left
+    untouched so it can be wrapped with other entries elsewhere:
+
+        path('', vite_entries('myapp/js/main.js')(views.home))
+    """
+    def decorator(view_func: Callable) -> Callable:
+        if asyncio.iscoroutinefunction(view_func):
+            async def wrapper(*args, **kwargs):
+                return await view_func(*args, **kwargs)
+        else:
+            def wrapper(*args, **kwargs):
+                return view_func(*args, **kwargs)
+        wrapper = functools.wraps(view_func)(wrapper)
+        wrapper.vite_entries = entries
+        return wrapper
+    return decorator
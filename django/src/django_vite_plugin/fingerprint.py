@@ -0,0 +1,124 @@
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, Union
+from django.conf import settings
+
+# Fingerprints map files to their modification time in nanoseconds,
+# kept as strings since they do not fit in a JavaScript number
+
+# Set by the Vite plugin on the processes it starts to how it started them
+PLUGIN_ARGS_ENV = 'DJANGO_VITE_PLUGIN_ARGS'
+
+# Modification times of the files a long lived process loaded once, taken
+# when it loaded them
+LOADED_MTIMES: Dict[str, Union[str, None]] = {}
+
+
+def get_mtime(path: str) -> Union[str, None]:
+    """Get the modification time of a file as written in fingerprints."""
+    try:
+        return str(os.stat(path).st_mtime_ns)
+    except OSError:
+        return None
+
+
+def freeze_mtimes(files: Iterable[str]) -> None:
+    """
+    Record the modification times of files this process loaded once, like
+    the settings. Fingerprints keep them, so that the artifacts written from
+    what was loaded are stale once the files change.
+    """
+    for file in files:
+        LOADED_MTIMES.setdefault(file, get_mtime(file))
+
+
+def make_fingerprint(files: Iterable[str]) -> Dict[str, Union[str, None]]:
+    """
+    Get the modification times of files, None for the missing ones
+    The ones of loaded files are the times they had when they were loaded
+    """
+    return {
+        file: LOADED_MTIMES[file] if file in LOADED_MTIMES else get_mtime(file)
+        for file in sorted(set(files))
+    }
+
+
+def is_fresh(fingerprint: Dict[str, Union[str, None]]) -> bool:
+    """Check that none of the files of a fingerprint was modified."""
+    return all(get_mtime(file) == mtime for file, mtime in fingerprint.items())
+
+
+def get_settings_files() -> list:
+    """
+    Get the files of the settings module and of the modules next to it
+    that are loaded, like the ones it imports its values from
+    """
+    name = getattr(settings, 'SETTINGS_MODULE', None) or ''
+    package = name.rpartition('.')[0] or name
+    files = []
+    for module_name, module in list(sys.modules.items()):
+        if module_name == package or module_name.startswith(package + '.'):
+            file = getattr(module, '__file__', None)
+            if file:
+                files.append(file)
+    return files
+
+
+def read_artifact(path: Path, format: int) -> Union[Dict[str, Any], None]:
+    """
+    Read a JSON file written by `write_artifact`
+    Returns None if it does not exist, has another format, was written
+    with other settings or is not fresh
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as artifact_file:
+            data = json.load(artifact_file)
+    except (OSError, ValueError):
+        return None
+
+    if (
+        not isinstance(data, dict)
+        or data.get('format') != format
+        or data.get('settings_module') != getattr(settings, 'SETTINGS_MODULE', None)
+        or not isinstance(data.get('fingerprint'), dict)
+        or not is_fresh(data['fingerprint'])
+    ):
+        return None
+    return data
+
+
+def write_artifact(path: Path, data: Dict[str, Any]) -> None:
+    """
+    Write a JSON file, replacing the old one at once
+    It records the settings module and the arguments the Vite plugin
+    started this process with, other settings give other results. A process
+    started by hand keeps the arguments of the file it replaces if it was
+    written with the same settings, so the Vite plugin still reads it.
+    """
+    data = {**data, 'settings_module': getattr(settings, 'SETTINGS_MODULE', None)}
+    plugin_args = os.environ.get(PLUGIN_ARGS_ENV)
+    try:
+        data['plugin_args'] = json.loads(plugin_args) if plugin_args else None
+    except ValueError:
+        data['plugin_args'] = None
+    if plugin_args is None:
+        data['plugin_args'] = _get_plugin_args(path, data['settings_module'])
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as artifact_file:
+        json.dump(data, artifact_file)
+    os.replace(tmp_path, path)
+
+
+def _get_plugin_args(path: Path, settings_module: Union[str, None]) -> Any:
+    """Get the arguments recorded in a file written with the same settings."""
+    try:
+        with open(path, 'r', encoding='utf-8') as artifact_file:
+            data = json.load(artifact_file)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get('settings_module') != settings_module:
+        return None
+    return data.get('plugin_args')
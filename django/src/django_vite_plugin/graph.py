@@ -0,0 +1,164 @@
+from typing import Dict, List, Set, Tuple
+from .store import ManifestStore
+
+
+class ManifestGraph:
+    """
+    Import graph of a Vite manifest
+
+    The transitive closures of every chunk are computed once and memoized,
+    chunks that import each other are resolved without recursing forever.
+    """
+
+    def __init__(
+        self,
+        store: ManifestStore,
+        closures: Dict[int, Tuple[int, ...]] = None,
+        cycles: List[Tuple[str, ...]] = None
+    ):
+        self.store = store
+        # Chunks that form an import cycle, in the order they were found
+        self.cycles: List[Tuple[str, ...]] = cycles or []
+        # Closures by chunk id, possibly resolved before by a compiled manifest
+        self._closures: Dict[int, Tuple[int, ...]] = closures or {}
+        self._css: Dict[str, Tuple[str, ...]] = {}
+        self._imports: Dict[str, Tuple[str, ...]] = {}
+        self._assets: Dict[str, Tuple[str, ...]] = {}
+        self._order: Tuple[str, ...] = None
+
+    def chunks(self, path: str) -> Tuple[str, ...]:
+        """
+        Get the chunks statically imported by `path`, directly or not,
+        dependencies first and `path` itself last
+        """
+        chunks = self.store.chunks
+        return tuple(chunks[id].key for id in self._closure(self._get_id(path)))
+
+    def css(self, path: str) -> Tuple[str, ...]:
+        """Get the stylesheets required by `path`."""
+        css = self._css.get(path)
+        if css is None:
+            css = self._css[path] = self._collect(path, 'css')
+        return css
+
+    def imports(self, path: str) -> Tuple[str, ...]:
+        """Get the files of the JS chunks imported by `path`."""
+        imports = self._imports.get(path)
+        if imports is None:
+            chunks = self.store.chunks
+            path_id = self._get_id(path)
+            imports = self._imports[path] = tuple(
+                chunks[id].file
+                for id in self._closure(path_id)
+                if id != path_id
+            )
+        return imports
+
+    def assets(self, path: str) -> Tuple[str, ...]:
+        """Get the static assets referenced by `path` and its imports."""
+        assets = self._assets.get(path)
+        if assets is None:
+            assets = self._assets[path] = self._collect(path, 'assets')
+        return assets
+
+    def order(self) -> Tuple[str, ...]:
+        """Get every chunk of the manifest, dependencies first."""
+        if self._order is None:
+            chunks = self.store.chunks
+            order: Dict[int, None] = {}
+            for chunk in sorted(chunks, key=lambda chunk: chunk.key):
+                order.update(dict.fromkeys(self._closure(chunk.id)))
+            self._order = tuple(chunks[id].key for id in order)
+        return self._order
+
+    def closures(self) -> Dict[int, Tuple[int, ...]]:
+        """Get the resolved closure of every chunk in the manifest by id."""
+        self.order()
+        return self._closures
+
+    def _get_id(self, path: str) -> int:
+        id = self.store.ids.get(path)
+        if id is None:
+            raise RuntimeError(f"Cannot find {path} in Vite manifest")
+        return id
+
+    def _collect(self, path: str, field: str) -> Tuple[str, ...]:
+        chunks = self.store.chunks
+        files: Dict[str, None] = {}
+        for id in self._closure(self._get_id(path)):
+            files.update(dict.fromkeys(getattr(chunks[id], field)))
+        return tuple(files)
+
+    def _closure(self, id: int) -> Tuple[int, ...]:
+        closure = self._closures.get(id)
+        if closure is None:
+            self._resolve(id)
+            closure = self._closures[id]
+        return closure
+
+    def _resolve(self, root: int) -> None:
+        """
+        Depth first walk from `root` memoizing the closure of every chunk
+        that does not depend on a chunk still being walked (Tarjan's SCC).
+        Inside a cycle only the first chunk reached gets memoized, the rest
+        are resolved again when they are asked for directly.
+        """
+        store = self.store
+        closures = self._closures
+        index: Dict[int, int] = {root: 0}
+        low: Dict[int, int] = {root: 0}
+        found: Dict[int, Dict[int, None]] = {root: {}}
+        stack: List[int] = [root]
+        on_stack: Set[int] = {root}
+        # Non memoized chunks of finished cycles mapped to their first chunk
+        cycle_root: Dict[int, int] = {}
+        self_imports: Set[int] = set()
+        work = [(root, iter(store.imports(root)))]
+
+        while work:
+            id, children = work[-1]
+            descended = False
+
+            for child in children:
+                if child in closures:
+                    found[id].update(dict.fromkeys(closures[child]))
+                elif child not in index:
+                    index[child] = low[child] = len(index)
+                    found[child] = {}
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(store.imports(child))))
+                    descended = True
+                    break
+                elif child in on_stack:
+                    low[id] = min(low[id], index[child])
+                    if child == id:
+                        self_imports.add(id)
+                else:
+                    found[id].update(dict.fromkeys(closures[cycle_root[child]]))
+
+            if descended:
+                continue
+
+            work.pop()
+            # A chunk of a cycle may already be in its own closure
+            found[id].pop(id, None)
+            found[id][id] = None
+
+            if low[id] == index[id]:
+                cycle = []
+                while True:
+                    chunk = stack.pop()
+                    on_stack.discard(chunk)
+                    cycle.append(store.chunks[chunk].key)
+                    if chunk == id:
+                        break
+                    cycle_root[chunk] = id
+                closures[id] = tuple(found[id])
+                if len(cycle) > 1 or id in self_imports:
+                    self.cycles.append(tuple(reversed(cycle)))
+
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[id])
+                found[parent].update(found[id])
@@ -1,6 +1,4 @@
 from typing import Dict, Any
-from .constants import DEFAULT_CONFIG, CSS_EXTENSIONS
-from .cache import DEV_SERVER
 
 def make_attrs(attrs: Dict[str, Any]) -> str:
     """Compile attributes to a string."""
@@ -17,24 +15,6 @@ def get_html(url: str, attrs: Dict[str, str]) -> str:
 
 def get_html_dev(url: str, attrs: Dict[str, str]) -> str:
     """Generate HTML for development mode."""
-    global DEV_SERVER
-    if DEV_SERVER is None:
-        try:
-            with open(DEFAULT_CONFIG['HOT_FILE'], 'r') as hotfile:
-                DEV_SERVER = hotfile.read()
-        except:
-            raise Exception("Vite dev server is not started!")
-
-    if any(url.endswith(ext) for ext in CSS_EXTENSIONS):
-        return f'<link {attrs["css"]} href="{DEV_SERVER}/{url}" />'
-    elif url == 'react':
-        return f"""
-        <script type="module">
-        import RefreshRuntime from "{DEV_SERVER}/@react-refresh"
-        RefreshRuntime.injectIntoGlobalHook(window)
-        window.$RefreshReg$ = () => {{}}
-        window.$RefreshSig$ = () => (type) => type
-        window.__vite_plugin_react_preamble_installed__ = true
-        </script>
-        """
-    return f'<script {attrs["js"]} src="{DEV_SERVER}/{url}"></script>' 
\ No newline at end of file
+    # The dev server URL is read once, thread-safely, by `utils`
+    from .utils import get_html_dev as get_utils_html_dev
+    return get_utils_html_dev(url, attrs)
@@ -0,0 +1,204 @@
+from typing import Any, Dict, Hashable, List, Tuple, Type, Union
+from jinja2 import nodes
+from jinja2.environment import Environment
+from jinja2.ext import Extension
+from jinja2.parser import Parser
+from jinja2.runtime import Context
+from markupsafe import Markup
+from .utils import CONFIG, find_asset, get_compiled_manifest, is_current_source
+from .templatetags.utils import (
+    EMITTED_KEY,
+    get_attrs_key,
+    get_template_parts,
+    join_new_parts,
+    make_template_asset,
+    make_template_attrs,
+)
+
+
+class ViteExtension(Extension):
+    """
+    Jinja2 extension rendering Vite assets with `{% vite %}`
+
+    It takes the same arguments as the Django tag, separated by spaces or
+    commas. Tags without variables are rendered when the template is compiled.
+    """
+
+    tags = {'vite'}
+
+    def __init__(self, environment: Environment):
+        super().__init__(environment)
+        # Tags without variables keyed by their found assets and attributes,
+        # with the manifest they were rendered from
+        self.static_tags: Dict[Hashable, Tuple[Any, Tuple[str, ...]]] = {}
+        if CONFIG['DEDUPLICATE']:
+            environment.context_class = make_context_class(environment.context_class)
+
+    def parse(self, parser: Parser) -> nodes.Output:
+        lineno = next(parser.stream).lineno
+        assets: List[nodes.Expr] = []
+        attributes: Dict[str, nodes.Expr] = {}
+
+        while parser.stream.current.type != 'block_end':
+            if assets or attributes:
+                parser.stream.skip_if('comma')
+                if parser.stream.current.type == 'block_end':
+                    break
+            if parser.stream.current.type == 'name' and parser.stream.look().type in ('assign', 'sub'):
+                name = parse_attr_name(parser)
+                parser.stream.expect('assign')
+                attributes[name] = parser.parse_expression()
+            else:
+                assets.append(parser.parse_expression())
+
+        eval_ctx = nodes.EvalContext(self.environment)
+        try:
+            values = [asset.as_const(eval_ctx) for asset in assets]
+            attrs = {name: value.as_const(eval_ctx) for name, value in attributes.items()}
+        except nodes.Impossible:
+            return self.make_dynamic(assets, attributes, eval_ctx).set_lineno(lineno)
+        return self.make_static(values, attrs).set_lineno(lineno)
+
+    def make_static(self, values: List[Any], attributes: Dict[str, Any]) -> nodes.Output:
+        """
+        Render a tag without any variables
+        It becomes constant output unless it has to be deduplicated or the
+        manifest may be reloaded
+        """
+        if not values and not attributes and CONFIG['DEV_MODE']:
+            assets = (CONFIG['WS_CLIENT'],)
+        else:
+            assets = find_literal_assets(values)
+        # Keyed by the compiled attributes, which tell `True` from `1`
+        attrs = make_template_attrs(attributes)
+        key = (assets, (attrs['js'], attrs['css'], attrs['preload']))
+        manifest, parts = self.static_tags[key] = self.render_static(key)
+
+        if not CONFIG['DEDUPLICATE'] and CONFIG['MANIFEST_WATCH_INTERVAL'] is None:
+            return nodes.Output([nodes.TemplateData(''.join(parts))])
+        return nodes.Output([
+            self.call_method('_render_static', [nodes.ContextReference(), nodes.Const(key)])
+        ])
+
+    def make_dynamic(
+        self,
+        assets: List[nodes.Expr],
+        attributes: Dict[str, nodes.Expr],
+        eval_ctx: nodes.EvalContext
+    ) -> nodes.Output:
+        """
+        Make the output of a tag with variables, its literal assets are
+        found at once
+        """
+        args: List[nodes.Expr] = []
+        is_variable: List[bool] = []
+        for asset in assets:
+            try:
+                value = asset.as_const(eval_ctx)
+            except nodes.Impossible:
+                args.append(asset)
+                is_variable.append(True)
+                continue
+            for path in find_literal_assets([value]):
+                args.append(nodes.Const(path))
+                is_variable.append(False)
+
+        return nodes.Output([self.call_method('_render', [
+            nodes.ContextReference(),
+            nodes.List(args),
+            nodes.Const(tuple(is_variable)),
+            nodes.Dict([nodes.Pair(nodes.Const(name), value) for name, value in attributes.items()]),
+        ])])
+
+    def render_static(self, key: Tuple[Tuple[str, ...], Tuple[str, str, Union[str, None]]]) -> Tuple[Any, Tuple[str, ...]]:
+        """Render the tags of found assets, with the manifest they come from."""
+        assets, (js_attrs, css_attrs, preload_attrs) = key
+        attrs = {'js': js_attrs, 'css': css_attrs, 'preload': preload_attrs}
+        manifest = get_compiled_manifest()
+        parts = ()
+        for asset in assets:
+            parts += make_template_asset(asset, attrs)
+        return (manifest, parts)
+
+    def emit(self, context: Context, parts: Tuple[str, ...]) -> Markup:
+        """
+        Join the tags of the assets, leaving out the ones already emitted
+        while rendering the same template, its parents or included templates
+        """
+        if not CONFIG['DEDUPLICATE']:
+            return Markup(''.join(parts))
+
+        # The variables of a render are copied into the templates it
+        # includes, so is a reference to the set created with its context
+        state = context.parent
+        emitted = state.get(EMITTED_KEY)
+        if emitted is None:
+            emitted = state[EMITTED_KEY] = set()
+        return Markup(join_new_parts(emitted, parts))
+
+    def _render_static(self, context: Context, key: Hashable) -> Markup:
+        tags = self.static_tags.get(key)
+        # Templates loaded from a bytecode cache were compiled elsewhere
+        if tags is None or not is_current_source(tags[0]):
+            tags = self.static_tags[key] = self.render_static(key)
+        return self.emit(context, tags[1])
+
+    def _render(
+        self,
+        context: Context,
+        assets: List[Any],
+        is_variable: Tuple[bool, ...],
+        attributes: Dict[str, Any]
+    ) -> Markup:
+        resolved = []
+        for value, variable in zip(assets, is_variable):
+            if not variable:
+                resolved.append((value, False))
+            elif isinstance(value, (list, tuple)):
+                resolved += [(item, True) for item in value if item]
+            elif value:
+                resolved.append((value, True))
+        parts = get_template_parts(tuple(resolved), get_attrs_key(attributes), attributes)
+        return self.emit(context, parts)
+
+
+def make_context_class(context_class: Type[Context]) -> Type[Context]:
+    """
+    Make a context class creating the set of the tags emitted by a render
+    with its first context. Templates included with local variables get a
+    copy of the variables, which must already hold the set.
+    """
+    if issubclass(context_class, ViteContext):
+        return context_class
+    if context_class is Context:
+        return ViteContext
+    return type(f'Vite{context_class.__name__}', (ViteContext, context_class), {})
+
+
+class ViteContext(Context):
+    """Context of a render with the set of the tags it emitted."""
+
+    def __init__(self, environment: Environment, parent: Dict[str, Any], *args: Any, **kwargs: Any):
+        # Included templates share the set of the template including them
+        if EMITTED_KEY not in parent:
+            parent[EMITTED_KEY] = set()
+        super().__init__(environment, parent, *args, **kwargs)
+
+
+def parse_attr_name(parser: Parser) -> str:
+    """Parse the name of an attribute, which may contain dashes."""
+    name = parser.stream.expect('name').value
+    while parser.stream.skip_if('sub'):
+        name += '-' + parser.stream.expect('name').value
+    return name
+
+
+def find_literal_assets(values: List[Any]) -> Tuple[str, ...]:
+    """Find literal assets, a literal list counting as its items."""
+    assets = []
+    for value in values:
+        if isinstance(value, (list, tuple)):
+            assets += [find_asset(item) for item in value if item]
+        elif value:
+            assets.append(find_asset(value))
+    return tuple(assets)
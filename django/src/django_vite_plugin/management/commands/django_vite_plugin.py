@@ -1,8 +1,21 @@
-from typing import Any
-from django.core.management.base import BaseCommand, CommandParser
+import sys
+from typing import Any, Dict, List
+from django.core.management.base import BaseCommand, CommandError, CommandParser
 import json
 from ...config_helper import get_config
-from .utils import format_config_for_output, find_static_assets
+from ...utils import write_compiled_manifest, write_offline_tags
+from ...static_lookup import write_static_lookup
+from ...config_snapshot import get_config_files, write_config_snapshot, write_entries_snapshot
+from ...fingerprint import freeze_mtimes
+from .utils import (
+    format_config_for_output,
+    find_static_assets,
+    find_template_entries,
+    get_app_aliases,
+    get_found_paths,
+    get_installed_apps,
+    prerender_tags,
+)
 
 class Command(BaseCommand):
     """Management command for django-vite-plugin operations."""
@@ -22,19 +35,111 @@ class Command(BaseCommand):
             default='find_static'
         )
 
+        parser.add_argument(
+            '--serve-stdio',
+            help='Answer JSON-RPC requests read from stdin, one per line',
+            action='store_true'
+        )
+
     def handle(self, **options: Any) -> None:
         """Handle the command execution."""
-        if options['action'] == 'config':
+        if options['serve_stdio']:
+            self.serve_stdio()
+        elif options['action'] == 'config':
             self.print_config()
+        elif options['action'] == 'compile':
+            self.compile_manifest()
+        elif options['action'] == 'prerender':
+            self.prerender()
+        elif options['action'] == 'entries':
+            self.stdout.write(json.dumps(self.find_entries()))
+        elif options['action'] == 'static_lookup':
+            self.write_static_lookup(options['find_static'] or [])
         elif options['find_static'] is not None:
-            founds = find_static_assets(options['find_static'])
             self.stdout.write(
-                json.dumps(founds),
+                json.dumps(self.find_static(options['find_static'])),
                 ending=''
             )
-    
+
+    def serve_stdio(self):
+        """
+        Answer the requests of the Vite plugin until stdin is closed, so that
+        Django is only set up once for the whole life of the dev server
+        """
+        # The settings were loaded at start, the snapshots written from them
+        # must be stale as soon as their files change
+        freeze_mtimes(get_config_files(get_installed_apps().values()))
+        methods = {
+            'config': lambda params: self.get_config(),
+            'find_static': lambda params: self.find_static(params.get('assets', [])),
+            'aliases': lambda params: get_app_aliases(),
+            'entries': lambda params: self.find_entries(),
+        }
+        for line in sys.stdin:
+            if not line.strip():
+                continue
+            id = None
+            try:
+                request = json.loads(line)
+                id = request.get('id')
+                method = methods.get(request.get('method'))
+                if method is None:
+                    response = self.rpc_error(id, -32601, f"Unknown method {request.get('method')}")
+                else:
+                    result = method(request.get('params') or {})
+                    response = {'jsonrpc': '2.0', 'id': id, 'result': result}
+            except ValueError as error:
+                response = self.rpc_error(id, -32700, str(error))
+            except Exception as error:
+                response = self.rpc_error(id, -32603, str(error))
+            self.stdout.write(json.dumps(response))
+            self.stdout.flush()
+
+    def rpc_error(self, id: Any, code: int, message: str) -> Dict[str, Any]:
+        """Make a JSON-RPC error response."""
+        return {'jsonrpc': '2.0', 'id': id, 'error': {'code': code, 'message': message}}
+
+    def get_config(self) -> Dict[str, Any]:
+        """Get the configuration as sent to the Vite plugin, saving a snapshot of it."""
+        config = format_config_for_output(dict(get_config()))
+        # Let the next runs of Vite start without Python while it is unchanged
+        write_config_snapshot(config, config['INSTALLED_APPS'].values())
+        return config
+
+    def find_static(self, assets: List[str]) -> List[str]:
+        """Find static assets, recording them in the lookup file."""
+        founds = find_static_assets(assets)
+        # Let the next runs skip the lookup while the static dirs are unchanged
+        write_static_lookup(get_found_paths(assets, founds))
+        return founds
+
+    def find_entries(self) -> List[str]:
+        """Find the assets used by the templates, saving a snapshot of them."""
+        entries = find_template_entries()
+        write_entries_snapshot(entries)
+        return entries
+
     def print_config(self):
         """Print the current configuration."""
-        config = get_config()
-        config = format_config_for_output(config)
-        self.stdout.write(json.dumps(config))
+        self.stdout.write(json.dumps(self.get_config()))
+
+    def write_static_lookup(self, assets: list):
+        """Write the resolved paths of the assets to the lookup file."""
+        path = write_static_lookup(get_found_paths(assets, find_static_assets(assets)))
+        if path is None:
+            self.stderr.write('Some static finders cannot be fingerprinted, no lookup file written')
+        else:
+            self.stdout.write(f'Static lookup written to {path}')
+
+    def prerender(self):
+        """Render the tags of the templates ahead of time, next to the manifest."""
+        if get_config()['DEV_MODE']:
+            raise CommandError('Tags cannot be prerendered in DEV_MODE')
+        tags = prerender_tags()
+        path = write_offline_tags(tags)
+        self.stdout.write(f'{len(tags)} tags prerendered to {path}')
+
+    def compile_manifest(self):
+        """Write the compiled manifest next to the manifest."""
+        path = write_compiled_manifest()
+        self.stdout.write(f'Compiled manifest written to {path}')
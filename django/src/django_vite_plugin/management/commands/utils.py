@@ -1,7 +1,11 @@
-from typing import Dict
+from typing import Dict, Tuple
 from django.apps import apps
 import django
-from ...utils import find_asset
+from ...config_helper import get_config
+from ...utils import find_asset_uncached
+from ...offline import get_tag_key
+from ...scanner import find_vite_entries, find_vite_tags, is_literal
+from ...templatetags.utils import make_template_asset, make_template_attrs, parse_template_args
 
 def get_installed_apps() -> Dict[str, str]:
     """Get a mapping of installed app names to their paths."""
@@ -12,6 +16,16 @@ def get_installed_apps() -> Dict[str, str]:
         if '.' not in app_config.name and app_config.name != 'django_vite_plugin'
     }
 
+def get_app_aliases() -> Dict[str, str]:
+    """Get the import aliases of the installed apps, as the Vite plugin defines them."""
+    trail = get_config()['STATIC_LOOKUP']
+    aliases = {'@': ''}
+    for name, path in get_installed_apps().items():
+        suffix = f'/{name}' if trail else ''
+        aliases[f'@s:{name}'] = f'{path}/static{suffix}'.replace('\\', '/')
+        aliases[f'@t:{name}'] = f'{path}/templates{suffix}'.replace('\\', '/')
+    return aliases
+
 def format_config_for_output(config: Dict) -> Dict:
     """Format configuration for JSON output."""
     if isinstance(config["BUILD_DIR"], str):
@@ -20,10 +34,49 @@ def format_config_for_output(config: Dict) -> Dict:
         config["BUILD_DIR"] = str(config["BUILD_DIR"])
     
     config['MANIFEST'] = str(config['MANIFEST'])
+    config['CACHE_DIR'] = str(config['CACHE_DIR'])
     config['INSTALLED_APPS'] = get_installed_apps()
     config['DJANGO_VERSION'] = django.get_version()
     return config
 
 def find_static_assets(assets: list[str]) -> list[str]:
-    """Find static assets using the asset finder."""
-    return [find_asset(asset) for asset in assets] 
\ No newline at end of file
+    """
+    Find static assets using the static finders
+    The caches of this process are skipped, it may answer for the whole
+    life of the dev server while files are created
+    """
+    return [find_asset_uncached(asset) for asset in assets]
+
+def get_found_paths(assets: list[str], founds: list[str]) -> Dict[str, str]:
+    """
+    Map the assets to their found paths, leaving out the ones not found
+    They could be created at any time, a lookup file must not keep them
+    """
+    return {
+        asset: found
+        for asset, found in zip(assets, founds)
+        if found != asset.strip('/\\')
+    }
+
+def find_template_entries() -> list[str]:
+    """Find the assets of the `{% vite %}` and `{% vite_head %}` tags of every template."""
+    return [
+        find_asset_uncached(entry)
+        for entry in find_vite_entries()
+        if entry != 'react'
+    ]
+
+
+def prerender_tags() -> Dict[str, Tuple[str, ...]]:
+    """Render the `{% vite %}` tags of every template that use no variable."""
+    tags = {}
+    for _, _, bits in find_vite_tags(('vite',)):
+        if not all(is_literal(bit) for bit in bits[1:]):
+            continue
+        assets, attributes, _, _ = parse_template_args(bits[1:])
+        attrs = make_template_attrs(attributes)
+        parts = ()
+        for asset in assets:
+            parts += make_template_asset(asset, attrs)
+        tags[get_tag_key(bits)] = parts
+    return tags
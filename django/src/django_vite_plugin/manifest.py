@@ -1,24 +1,51 @@
+import hashlib
 import json
+import os
 import sys
 from pathlib import Path
-from typing import Dict, Any
-from .cache import VITE_MANIFEST
+from typing import Dict, Any, Tuple, Union
 
 def load_manifest(manifest_path: Path) -> Dict[str, Any]:
-    """Load and cache the Vite manifest file."""
+    """Load the Vite manifest file."""
+    return parse_manifest(manifest_path, read_manifest_file(manifest_path)[1])
+
+def read_manifest_file(manifest_path: Path) -> Tuple[Union[Tuple[int, int, int], None], Union[bytes, None]]:
+    """
+    Read the contents of the manifest file along with the signature of the
+    file that was read, (None, None) if it cannot be read
+    """
     try:
-        with open(manifest_path, "r") as manifest_file:
-            manifest_data = json.load(manifest_file)
-            VITE_MANIFEST.update(manifest_data)
-            return manifest_data
-    except FileNotFoundError:
+        with open(manifest_path, "rb") as manifest_file:
+            stat = os.fstat(manifest_file.fileno())
+            content = manifest_file.read()
+    except OSError:
+        return (None, None)
+    return ((stat.st_ino, stat.st_mtime_ns, stat.st_size), content)
+
+def parse_manifest(manifest_path: Path, content: Union[bytes, None]) -> Dict[str, Any]:
+    """Parse the contents of the manifest file, read by `read_manifest_file`."""
+    if content is None:
         sys.stderr.write(f"Cannot read Vite manifest file at {manifest_path}\n")
         return {}
+    try:
+        return json.loads(content)
     except Exception as error:
         raise RuntimeError(f"Cannot read Vite manifest file at {manifest_path}: {error}")
 
-def get_manifest_entry(path: str) -> Dict[str, Any]:
-    """Get a manifest entry by path."""
-    if path not in VITE_MANIFEST:
-        raise RuntimeError(f"Cannot find {path} in Vite manifest")
-    return VITE_MANIFEST[path]
+def get_manifest_signature(manifest_path: Path) -> Union[Tuple[int, int, int], None]:
+    """Get the inode, modification time and size of the manifest file."""
+    try:
+        stat = os.stat(manifest_path)
+    except OSError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+def get_manifest_hash(manifest_path: Path) -> Union[str, None]:
+    """Get the hash of the manifest file contents."""
+    return hash_manifest(read_manifest_file(manifest_path)[1])
+
+def hash_manifest(content: Union[bytes, None]) -> Union[str, None]:
+    """Get the hash of the contents of the manifest file."""
+    if content is None:
+        return None
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
@@ -0,0 +1,91 @@
+from typing import Any, Callable, Dict, Tuple, Union
+from asgiref.sync import sync_to_async
+from django.http import HttpRequest, HttpResponse
+from django.urls import Resolver404, resolve
+from django.utils.deprecation import MiddlewareMixin
+from . import utils
+from .utils import get_preload_links
+
+
+class ViteLinkHeaderMiddleware(MiddlewareMixin):
+    """
+    Adds the assets of the Vite entries declared with `vite_entries` to the
+    `Link` header of the response, for proxies and CDNs that turn it into
+    an early hint or push the assets
+    """
+
+    def process_view(
+        self,
+        request: HttpRequest,
+        view_func: Callable,
+        view_args: Tuple[Any, ...],
+        view_kwargs: Dict[str, Any]
+    ) -> None:
+        entries = getattr(view_func, 'vite_entries', None)
+        if entries:
+            request.vite_preload_links = get_preload_links(entries)
+
+    def process_response(self, request: HttpRequest, response: HttpResponse) -> HttpResponse:
+        links = getattr(request, 'vite_preload_links', None)
+        if links:
+            if response.has_header('Link'):
+                links = (response['Link'],) + links
+            response['Link'] = ', '.join(links)
+        return response
+
+
+class EarlyHintsMiddleware:
+    """
+    ASGI middleware sending the assets of the Vite entries declared with
+    `vite_entries` as a `103 Early Hints` response before the view runs
+    Only servers supporting the `http.response.early_hint` extension are
+    sent anything
+
+        application = EarlyHintsMiddleware(get_asgi_application())
+    """
+
+    def __init__(self, app: Callable):
+        self.app = app
+        # Links of the entries of each view, with the manifest they come from
+        self.links: Dict[Tuple[str, ...], Tuple[Any, Tuple[str, ...]]] = {}
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope['type'] == 'http' and 'http.response.early_hint' in scope.get('extensions', {}):
+            entries = self.get_entries(scope)
+            links = self.get_cached_links(entries) if entries else ()
+            if links is None:
+                # Only the first lookups read the manifest and the static
+                # finders, in a thread of their own not to queue the requests
+                links = await sync_to_async(self.get_links, thread_sensitive=False)(entries)
+            if links:
+                await send({
+                    'type': 'http.response.early_hint',
+                    'links': [link.encode('latin-1') for link in links],
+                })
+        await self.app(scope, receive, send)
+
+    def get_entries(self, scope: Dict[str, Any]) -> Union[Tuple[str, ...], None]:
+        """Get the Vite entries of the view that will handle the request."""
+        path = scope['path']
+        root_path = scope.get('root_path', '')
+        if root_path and path.startswith(root_path):
+            path = path[len(root_path):]
+        try:
+            match = resolve(path)
+        except Resolver404:
+            return None
+        return getattr(match.func, 'vite_entries', None)
+
+    def get_cached_links(self, entries: Tuple[str, ...]) -> Union[Tuple[str, ...], None]:
+        """Get the preload links of entries if they come from the loaded manifest."""
+        cached = self.links.get(entries)
+        if cached is not None and cached[0] is utils.COMPILED_MANIFEST:
+            return cached[1]
+        return None
+
+    def get_links(self, entries: Tuple[str, ...]) -> Tuple[str, ...]:
+        """Get the preload links of entries, loading the manifest if needed."""
+        manifest = utils.get_compiled_manifest()
+        links = get_preload_links(entries)
+        self.links[entries] = (manifest, links)
+        return links
@@ -0,0 +1,78 @@
+import json
+import os
+from hashlib import blake2b
+from pathlib import Path
+from typing import Dict, Any, Tuple, Union
+
+# Bumped whenever the layout of the offline file changes
+OFFLINE_FORMAT = 1
+
+
+class OfflineTags:
+    """Tags of the templates rendered ahead of time by `--action prerender`."""
+
+    def __init__(self, source_hash: str, tags: Dict[str, Tuple[str, ...]]):
+        # Content hash of the manifest file the tags were rendered from
+        self.source_hash = source_hash
+        # Tags of every `{% vite %}` without variables, keyed by `get_tag_key`
+        self.tags = tags
+
+    def get(self, key: str) -> Union[Tuple[str, ...], None]:
+        """Get the tags rendered for a template tag."""
+        return self.tags.get(key)
+
+
+def get_tag_key(bits: Tuple[str, ...]) -> str:
+    """Get the key of a template tag, from its split contents."""
+    return ' '.join(bits)
+
+
+def get_config_key(config: Dict[str, Any]) -> str:
+    """Get a hash of the settings the rendered tags depend on."""
+    settings = [
+        config[key]
+        for key in ('BUILD_URL_PREFIX', 'JS_ATTRS', 'CSS_ATTRS', 'MODULE_PRELOAD', 'STATIC_LOOKUP')
+    ]
+    return blake2b(json.dumps(settings, sort_keys=True, default=str).encode(), digest_size=16).hexdigest()
+
+
+def get_offline_path(manifest_path: Path) -> Path:
+    """Get the path of the prerendered tags, next to the manifest itself."""
+    return Path(manifest_path).with_name('offline.json')
+
+
+def save_offline_tags(offline: OfflineTags, config_key: str, path: Path) -> None:
+    """Write prerendered tags to a file, replacing the old one at once."""
+    data = {
+        'format': OFFLINE_FORMAT,
+        'source_hash': offline.source_hash,
+        'config_key': config_key,
+        'tags': offline.tags,
+    }
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as offline_file:
+        json.dump(data, offline_file)
+    os.replace(tmp_path, path)
+
+
+def load_offline_tags(path: Path, source_hash: str, config_key: str) -> Union[OfflineTags, None]:
+    """
+    Load prerendered tags
+    Returns None if they do not exist or were rendered from another
+    manifest or configuration
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as offline_file:
+            data = json.load(offline_file)
+    except (OSError, ValueError):
+        return None
+
+    if (
+        not isinstance(data, dict)
+        or data.get('format') != OFFLINE_FORMAT
+        or data.get('source_hash') != source_hash
+        or data.get('config_key') != config_key
+        or not isinstance(data.get('tags'), dict)
+    ):
+        return None
+    return OfflineTags(source_hash, {key: tuple(parts) for key, parts in data['tags'].items()})
@@ -0,0 +1,80 @@
+import os
+from typing import Dict, Iterable, Iterator, List, Tuple
+from django.template import engines
+from django.template.backends.django import DjangoTemplates
+from django.template.base import Lexer, TokenType
+from django.template.utils import get_app_template_dirs
+
+# Tags of this plugin taking entries
+VITE_TAGS = ('vite', 'vite_head')
+
+
+def get_template_dirs(engine: DjangoTemplates) -> List[str]:
+    """Get the directories the templates of an engine are loaded from."""
+    dirs = [str(template_dir) for template_dir in engine.engine.dirs]
+    if engine.engine.app_dirs:
+        dirs += [str(template_dir) for template_dir in get_app_template_dirs('templates')]
+    return dirs
+
+
+def find_vite_tags(tags: Iterable[str] = VITE_TAGS) -> Iterator[Tuple[DjangoTemplates, str, List[str]]]:
+    """
+    Find the tags of this plugin in the templates of every Django engine
+    Yields the engine, the template name and the bits of the tag
+    """
+    for engine in engines.all():
+        if not isinstance(engine, DjangoTemplates):
+            continue
+        for template_dir in get_template_dirs(engine):
+            for name, source in _read_templates(template_dir):
+                for token in Lexer(source).tokenize():
+                    if token.token_type != TokenType.BLOCK:
+                        continue
+                    bits = token.split_contents()
+                    if bits and bits[0] in tags:
+                        yield engine, name, bits
+
+
+def find_vite_entries(tags: Iterable[str] = VITE_TAGS) -> List[str]:
+    """Get the literal paths used by the tags of this plugin in every template."""
+    entries: Dict[str, None] = {}
+    for _, _, bits in find_vite_tags(tags):
+        for bit in bits[1:]:
+            # Attributes and variables are skipped
+            if '=' not in bit and is_literal(bit):
+                entries[bit[1:-1]] = None
+    return list(entries)
+
+
+def is_literal(bit: str) -> bool:
+    """Check if an argument of a tag is a quoted string or an attribute set to one."""
+    value = bit.split('=', maxsplit=1)[-1]
+    return len(value) > 1 and value[0] == value[-1] and value[0] in '"\''
+
+
+def get_template_files() -> List[str]:
+    """Get the template directories of every Django engine and the files in them."""
+    files = []
+    for engine in engines.all():
+        if not isinstance(engine, DjangoTemplates):
+            continue
+        for template_dir in get_template_dirs(engine):
+            for root, _, names in os.walk(template_dir):
+                files.append(root)
+                files += [os.path.join(root, name) for name in names]
+    return files
+
+
+def _read_templates(template_dir: str) -> Iterator[Tuple[str, str]]:
+    for root, _, files in os.walk(template_dir):
+        for file in files:
+            path = os.path.join(root, file)
+            try:
+                with open(path, 'r', encoding='utf-8') as template_file:
+                    source = template_file.read()
+            except (OSError, UnicodeDecodeError):
+                continue
+            # Skip the cost of tokenizing templates without any tag
+            if 'vite' not in source:
+                continue
+            yield os.path.relpath(path, template_dir).replace('\\', '/'), source
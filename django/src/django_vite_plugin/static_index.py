@@ -0,0 +1,149 @@
+import os
+import sys
+import threading
+from typing import Dict, List, Tuple, Union
+from django.conf import settings
+
+
+class StaticIndex:
+    """
+    Index of the files of every staticfiles finder
+
+    Gives the same result as `finders.find(path)` without touching the
+    file system: the locations of the finders are walked once and every
+    path is mapped to the first location it is found in.
+    """
+
+    def __init__(self, watch: bool = False):
+        # Re-scan the directories that changed when a path is not found
+        self.watch = watch
+        # (location, prefix) of the storages of the finders, in search order
+        self.roots: List[Tuple[str, str]] = []
+        self.paths: Dict[str, int] = {}
+        self.dir_mtimes: Dict[str, int] = {}
+        # False if some finders could not be indexed
+        self.complete = True
+        self._lock = threading.Lock()
+        self._build()
+
+    def find(self, path: str) -> Union[str, None]:
+        """Find the absolute path of a static file."""
+        key = path.replace('\\', '/')
+        root = self.paths.get(key)
+        if root is None and self.watch:
+            with self._lock:
+                self._refresh(key)
+            root = self.paths.get(key)
+
+        if root is None:
+            if self.complete:
+                return None
+            from django.contrib.staticfiles import finders
+            return finders.find(path, False)
+
+        location, prefix = self.roots[root]
+        if prefix:
+            key = key[len(prefix) + 1:]
+        return os.path.join(location, *key.split('/'))
+
+    def _build(self) -> None:
+        self.roots, self.complete = get_static_roots()
+        for root, (location, _) in enumerate(self.roots):
+            self._scan(root, location)
+
+    def _scan(self, root: int, directory: str) -> None:
+        location, prefix = self.roots[root]
+        # Real paths of the directories walked to reach each directory
+        parents: Dict[str, Tuple[str, ...]] = {directory: ()}
+        # Symlinked directories are followed, as the finders do
+        for dir_path, dirs, files in os.walk(directory, followlinks=True):
+            chain = parents.pop(dir_path, ()) + (os.path.realpath(dir_path),)
+            # Except the ones linking back to a parent, walked forever otherwise
+            kept = []
+            for name in dirs:
+                child = os.path.join(dir_path, name)
+                if os.path.realpath(child) not in chain:
+                    parents[child] = chain
+                    kept.append(name)
+            dirs[:] = kept
+            if self.watch:
+                self.dir_mtimes[dir_path] = _get_mtime(dir_path)
+            rel_dir = os.path.relpath(dir_path, location).replace('\\', '/')
+            parts = [part for part in (prefix, rel_dir) if part and part != '.']
+            base = '/'.join(parts) + '/' if parts else ''
+            for file in files:
+                key = sys.intern(base + file)
+                # Earlier finders and locations win, as in `finders.find`
+                if self.paths.get(key, root) >= root:
+                    self.paths[key] = root
+
+    def _refresh(self, key: str) -> None:
+        """Re-scan the directories that could contain `key` if they changed."""
+        for root, (location, prefix) in enumerate(self.roots):
+            directory = get_candidate_dir(location, prefix, key)
+            if directory is None:
+                continue
+            if self.dir_mtimes.get(directory) != _get_mtime(directory):
+                self._scan(root, directory)
+
+
+def get_static_roots() -> Tuple[List[Tuple[str, str]], bool]:
+    """
+    Get the (location, prefix) of the storages of every static finder,
+    in search order, and whether every finder exposes its storages
+    """
+    from django.contrib.staticfiles import finders
+    roots = []
+    complete = True
+    for finder in finders.get_finders():
+        storages = getattr(finder, 'storages', None)
+        if not isinstance(storages, dict):
+            complete = False
+            continue
+        for storage in storages.values():
+            location = getattr(storage, 'location', None)
+            if location is None:
+                complete = False
+                continue
+            prefix = (getattr(storage, 'prefix', None) or '').strip('/')
+            roots.append((str(location), prefix))
+    return roots, complete
+
+
+def get_candidate_dir(location: str, prefix: str, path: str) -> Union[str, None]:
+    """
+    Get the directory of `location` that would hold `path`, or its
+    closest existing parent since creating a directory modifies its parent
+    """
+    if prefix:
+        if not path.startswith(prefix + '/'):
+            return None
+        path = path[len(prefix) + 1:]
+    directory = os.path.dirname(os.path.join(location, *path.split('/')))
+    while not os.path.isdir(directory) and len(directory) > len(location):
+        directory = os.path.dirname(directory)
+    if not directory.startswith(location):
+        return None
+    return directory
+
+
+def _get_mtime(path: str) -> Union[int, None]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+STATIC_INDEX: Union[StaticIndex, None] = None
+
+STATIC_INDEX_LOCK = threading.Lock()
+
+
+def get_static_index() -> StaticIndex:
+    """Get the static index, building it on the first call."""
+    global STATIC_INDEX
+    if STATIC_INDEX is None:
+        with STATIC_INDEX_LOCK:
+            if STATIC_INDEX is None:
+                STATIC_INDEX = StaticIndex(watch=settings.DEBUG)
+    return STATIC_INDEX
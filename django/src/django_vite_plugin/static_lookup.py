@@ -0,0 +1,76 @@
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Union
+from .config_helper import get_config
+from .fingerprint import get_settings_files, make_fingerprint, read_artifact, write_artifact
+from .static_index import get_candidate_dir, get_static_roots
+
+# Bumped whenever the layout of the lookup file changes
+LOOKUP_FORMAT = 1
+
+# Paths read from the lookup file on the first call of `get_static_lookup`
+STATIC_LOOKUP: Union[Dict[str, str], None] = None
+
+STATIC_LOOKUP_LOCK = threading.Lock()
+
+
+def get_lookup_path() -> Path:
+    """Get the path of the file the resolved static paths are written to."""
+    return Path(get_config()['CACHE_DIR']) / 'static_lookup.json'
+
+
+def get_fingerprint(paths: Iterable[str]) -> Dict[str, Union[str, None]]:
+    """
+    Get the modification times of the files a lookup of `paths` depends on:
+    the settings modules, listing the static directories, and the directories
+    of every location that would hold one of the paths
+    """
+    files = get_settings_files()
+    roots, _ = get_static_roots()
+    for path in paths:
+        path = path.replace('\\', '/')
+        for location, prefix in roots:
+            directory = get_candidate_dir(location, prefix, path)
+            if directory is not None:
+                files.append(directory)
+    return make_fingerprint(files)
+
+
+def read_static_lookup(path: Path) -> Dict[str, str]:
+    """
+    Read the resolved static paths from a lookup file
+    Returns an empty dict if it does not exist or is not fresh
+    """
+    data = read_artifact(path, LOOKUP_FORMAT)
+    if data is None or not isinstance(data.get('paths'), dict):
+        return {}
+    return data['paths']
+
+
+def write_static_lookup(paths: Dict[str, str]) -> Union[Path, None]:
+    """
+    Add resolved static paths to the lookup file, keeping the ones that are
+    still fresh. Nothing is written if some finders cannot be fingerprinted.
+    """
+    _, complete = get_static_roots()
+    if not complete:
+        return None
+
+    path = get_lookup_path()
+    paths = {**read_static_lookup(path), **paths}
+    write_artifact(path, {
+        'format': LOOKUP_FORMAT,
+        'fingerprint': get_fingerprint(paths),
+        'paths': paths,
+    })
+    return path
+
+
+def get_static_lookup() -> Dict[str, str]:
+    """Get the resolved static paths of the lookup file, read on the first call."""
+    global STATIC_LOOKUP
+    if STATIC_LOOKUP is None:
+        with STATIC_LOOKUP_LOCK:
+            if STATIC_LOOKUP is None:
+                STATIC_LOOKUP = read_static_lookup(get_lookup_path())
+    return STATIC_LOOKUP
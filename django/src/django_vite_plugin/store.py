@@ -0,0 +1,162 @@
+import sys
+from array import array
+from typing import Dict, Any, Iterable, List, Tuple, Union
+
+
+class ManifestChunk:
+    """A chunk of the Vite manifest."""
+
+    __slots__ = (
+        'id', 'key', 'file', 'src', 'name',
+        'is_entry', 'is_dynamic_entry', 'css', 'assets'
+    )
+
+    def __init__(
+        self,
+        id: int,
+        key: str,
+        file: str,
+        src: Union[str, None],
+        name: Union[str, None],
+        is_entry: bool,
+        is_dynamic_entry: bool,
+        css: Tuple[str, ...],
+        assets: Tuple[str, ...]
+    ):
+        self.id = id
+        self.key = key
+        self.file = file
+        self.src = src
+        self.name = name
+        self.is_entry = is_entry
+        self.is_dynamic_entry = is_dynamic_entry
+        self.css = css
+        self.assets = assets
+
+
+class ManifestStore:
+    """
+    Compact in-memory representation of a Vite manifest
+
+    Every path is interned, chunks are numbered in manifest order and the
+    imports of all chunks share one array of chunk ids, the imports of a
+    chunk being the range between its offset and the next one.
+    """
+
+    def __init__(self, chunks: List[ManifestChunk], imports: array, import_offsets: array,
+                 dynamic_imports: array, dynamic_import_offsets: array):
+        self.chunks = chunks
+        self.ids: Dict[str, int] = {chunk.key: chunk.id for chunk in chunks}
+        self._imports = imports
+        self._import_offsets = import_offsets
+        self._dynamic_imports = dynamic_imports
+        self._dynamic_import_offsets = dynamic_import_offsets
+
+    @classmethod
+    def from_manifest(cls, manifest: Dict[str, Any]) -> 'ManifestStore':
+        """Build the store from the parsed `manifest.json`."""
+        chunks = [
+            _make_chunk(
+                id, key, entry['file'], entry.get('src'), entry.get('name'),
+                entry.get('isEntry', False), entry.get('isDynamicEntry', False),
+                entry.get('css', ()), entry.get('assets', ())
+            )
+            for id, (key, entry) in enumerate(manifest.items())
+        ]
+        ids = {chunk.key: chunk.id for chunk in chunks}
+        imports, import_offsets = _make_adjacency(
+            (entry.get('imports', ()) for entry in manifest.values()), ids
+        )
+        dynamic_imports, dynamic_import_offsets = _make_adjacency(
+            (entry.get('dynamicImports', ()) for entry in manifest.values()), ids
+        )
+        return cls(chunks, imports, import_offsets, dynamic_imports, dynamic_import_offsets)
+
+    def __len__(self) -> int:
+        return len(self.chunks)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.ids
+
+    def __getitem__(self, key: str) -> ManifestChunk:
+        return self.chunks[self.ids[key]]
+
+    def get(self, key: str) -> Union[ManifestChunk, None]:
+        """Get a chunk by its key in the manifest."""
+        id = self.ids.get(key)
+        return None if id is None else self.chunks[id]
+
+    def imports(self, id: int) -> array:
+        """Get the ids of the chunks statically imported by a chunk."""
+        return self._imports[self._import_offsets[id]:self._import_offsets[id + 1]]
+
+    def dynamic_imports(self, id: int) -> array:
+        """Get the ids of the chunks dynamically imported by a chunk."""
+        return self._dynamic_imports[
+            self._dynamic_import_offsets[id]:self._dynamic_import_offsets[id + 1]
+        ]
+
+    def to_data(self) -> Dict[str, Any]:
+        """Get the store as plain data that `marshal` can write."""
+        return {
+            'chunks': [
+                (
+                    chunk.key, chunk.file, chunk.src, chunk.name,
+                    chunk.is_entry, chunk.is_dynamic_entry, chunk.css, chunk.assets
+                )
+                for chunk in self.chunks
+            ],
+            'imports': self._imports.tolist(),
+            'import_offsets': self._import_offsets.tolist(),
+            'dynamic_imports': self._dynamic_imports.tolist(),
+            'dynamic_import_offsets': self._dynamic_import_offsets.tolist(),
+        }
+
+    @classmethod
+    def from_data(cls, data: Dict[str, Any]) -> 'ManifestStore':
+        """Restore a store from the output of `to_data`."""
+        return cls(
+            [_make_chunk(id, *row) for id, row in enumerate(data['chunks'])],
+            array('I', data['imports']),
+            array('I', data['import_offsets']),
+            array('I', data['dynamic_imports']),
+            array('I', data['dynamic_import_offsets']),
+        )
+
+
+def _intern(value: Union[str, None]) -> Union[str, None]:
+    return None if value is None else sys.intern(value)
+
+
+def _make_chunk(
+    id: int,
+    key: str,
+    file: str,
+    src: Union[str, None],
+    name: Union[str, None],
+    is_entry: bool,
+    is_dynamic_entry: bool,
+    css: Iterable[str],
+    assets: Iterable[str]
+) -> ManifestChunk:
+    return ManifestChunk(
+        id,
+        sys.intern(key),
+        sys.intern(file),
+        _intern(src),
+        _intern(name),
+        bool(is_entry),
+        bool(is_dynamic_entry),
+        tuple(sys.intern(path) for path in css),
+        tuple(sys.intern(path) for path in assets),
+    )
+
+
+def _make_adjacency(edges: Iterable[Iterable[str]], ids: Dict[str, int]) -> Tuple[array, array]:
+    targets = array('I')
+    offsets = array('I', [0])
+    for keys in edges:
+        # Chunks missing from the manifest are ignored
+        targets.extend(ids[key] for key in keys if key in ids)
+        offsets.append(len(targets))
+    return targets, offsets
@@ -0,0 +1,72 @@
+import functools
+from contextvars import ContextVar
+from typing import Any, Dict, Set, Tuple, Union
+from django.core.signals import request_finished, request_started
+from django.template.base import UNKNOWN_SOURCE
+from .cache import LRUCache
+
+# Template files rendered by every page, keyed by the path of the page
+RENDERED_TEMPLATES = LRUCache(256)
+
+# Path of the current request and the templates it rendered so far
+CURRENT_PAGE: ContextVar[Union[Tuple[str, Set[str]], None]] = ContextVar(
+    'django_vite_plugin_current_page', default=None
+)
+
+
+def install() -> None:
+    """
+    Record the templates rendered by each request, for the Vite reloader
+    `Template._render` is wrapped, calling the render method it replaces.
+    Nothing is installed twice, nor over the render method of
+    `setup_test_environment`, which replaces this one while it is active.
+    """
+    from django.template import Template
+    from django.test.utils import instrumented_test_render
+
+    render = Template._render
+    if getattr(render, 'records_templates', False) or render is instrumented_test_render:
+        return
+
+    @functools.wraps(render)
+    def recording_render(self: Template, context: Any) -> Any:
+        _add_template(self)
+        return render(self, context)
+
+    recording_render.records_templates = True
+    Template._render = recording_render
+    request_started.connect(_start_page, dispatch_uid='django_vite_plugin_start_page')
+    request_finished.connect(_finish_page, dispatch_uid='django_vite_plugin_finish_page')
+
+
+def get_rendered_templates() -> Dict[str, Tuple[str, ...]]:
+    """Get the template files rendered by every page recently requested."""
+    return dict(RENDERED_TEMPLATES.items())
+
+
+def _start_page(sender: Any, environ: Dict[str, Any] = None, scope: Dict[str, Any] = None, **kwargs: Any) -> None:
+    if scope is not None:
+        path = scope.get('root_path', '') + scope.get('path', '')
+    elif environ is not None:
+        path = environ.get('SCRIPT_NAME', '') + environ.get('PATH_INFO', '')
+    else:
+        return
+    CURRENT_PAGE.set((path, set()))
+
+
+def _add_template(template: Any) -> None:
+    page = CURRENT_PAGE.get()
+    origin = getattr(template, 'origin', None)
+    if page is not None and origin is not None and origin.name != UNKNOWN_SOURCE:
+        page[1].add(str(origin.name))
+
+
+def _finish_page(sender: Any, **kwargs: Any) -> None:
+    page = CURRENT_PAGE.get()
+    if page is None:
+        return
+    path, templates = page
+    # Requests that render no template, like assets or APIs, are not pages
+    if templates:
+        RENDERED_TEMPLATES.set(path, tuple(sorted(templates)))
+    CURRENT_PAGE.set(None)
@@ -1,7 +1,16 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple
 from django import template
-from ..utils import find_asset
-from .utils import make_template_attrs, make_template_asset
+from ..bundle import Bundle, get_bundle
+from ..offline import OfflineTags
+from ..utils import get_compiled_manifest, is_current_source
+from .utils import (
+    make_template_attrs,
+    make_template_asset,
+    emit_template_assets,
+    get_attrs_key,
+    get_template_parts,
+    parse_template_args,
+)
 
 class ViteAssetNode(template.Node):
     """Template node for rendering Vite assets."""
@@ -11,44 +20,145 @@ class ViteAssetNode(template.Node):
         self.attributes = attributes
         self.html = None
         self.has_dynamic_path = has_dynamic_path
+        self.bits = None
 
         if not has_dynamic_attr:
             self.attrs = make_template_attrs(attributes)
             self.attributes = None
         
         if not has_dynamic_attr and not has_dynamic_path:
-            self.html = "".join(make_template_asset(asset, self.attrs) for asset in assets)
-            self.assets = None
+            self.html = self.render_static()
+
+    @classmethod
+    def from_offline(cls, bits: List[str], offline: OfflineTags, parts: Tuple[str, ...]) -> 'ViteAssetNode':
+        """
+        Make a node from tags rendered ahead of time
+        Its arguments are only parsed if the manifest changes
+        """
+        node = cls([], {}, True, False)
+        node.attributes = None
+        node.bits = bits
+        node.html = (offline, parts)
+        return node
+
+    def render_static(self) -> Tuple[Any, Tuple[str, ...]]:
+        """
+        Render a node without any variables
+        The result is kept with the manifest it was rendered from
+        """
+        if self.bits is not None:
+            # Prerendered node, see `from_offline`
+            assets, attributes, _, _ = parse_template_args(self.bits)
+            attrs = make_template_attrs(attributes)
+        else:
+            assets, attrs = self.assets, self.attrs
+
+        manifest = get_compiled_manifest()
+        parts = ()
+        for asset in assets:
+            parts += make_template_asset(asset, attrs)
+        return (manifest, parts)
 
     def render(self, context: template.Context) -> str:
-        """Render the node with the given context."""
+        """
+        Render the node with the given context
+        Nodes are shared by every thread rendering a cached template, only
+        `self.html` is ever replaced, at once, when the manifest changes
+        """
         if self.html is not None:
-            return self.html
+            source, parts = self.html
+            if not is_current_source(source):
+                # The manifest was reloaded since
+                html = self.html = self.render_static()
+                source, parts = html
+            return emit_template_assets(context, parts)
         
         if self.attributes is not None:
-            attrs = {
+            attributes = {
                 name: val.resolve(context) if not isinstance(val, str) else val
                 for name, val in self.attributes.items()
             }
-            self.attrs = make_template_attrs(attrs)
-        
-        return "".join(
-            make_template_asset(asset, self.attrs)
-            for asset in self.get_assets(context)
+            attrs_key = get_attrs_key(attributes)
+        else:
+            attributes = None
+            attrs_key = (self.attrs['js'], self.attrs['css'], self.attrs['preload'])
+
+        parts = get_template_parts(
+            self.resolve_assets(context),
+            attrs_key,
+            attributes,
+            self.attrs if attributes is None else None
         )
+        return emit_template_assets(context, parts)
 
-    def get_assets(self, context: template.Context) -> List[str]:
-        """Get resolved assets from context."""
-        if not self.has_dynamic_path:
-            return self.assets
-        
+    def resolve_assets(self, context: template.Context) -> Tuple[Tuple[Any, bool], ...]:
+        """
+        Get the assets of the node with their values in the context, each
+        with whether it still has to be found. A variable may hold a list.
+        """
         assets = []
         for var in self.assets:
             if isinstance(var, str):
-                assets.append(var)
-            else:
-                var = var.resolve(context)
-                if not var:
-                    continue
-                assets.append(find_asset(var))
-        return assets
+                assets.append((var, False))
+                continue
+            value = var.resolve(context)
+            if isinstance(value, (list, tuple)):
+                assets += [(item, True) for item in value if item]
+            elif value:
+                assets.append((value, True))
+        return tuple(assets)
+
+
+# Key of the bundles whose scripts are still to be emitted in the render context
+BUNDLES_KEY = 'django_vite_plugin_bundles'
+
+
+class ViteHeadNode(template.Node):
+    """
+    Template node of `{% vite_head %}`, rendering the stylesheets and
+    modulepreload links of its entries and keeping their scripts for
+    `{% vite_scripts %}`
+    """
+
+    def __init__(self, entries: List[Any], attributes: Dict[str, Any], is_static: bool):
+        self.entries = entries
+        self.attributes = attributes
+        self.bundle = self.render_static() if is_static else None
+
+    def render_static(self) -> Tuple[Any, Bundle]:
+        """Get the bundle of a node without variables, with its manifest."""
+        return (get_compiled_manifest(), get_bundle(self.entries, self.attributes))
+
+    def render(self, context: template.Context) -> str:
+        if self.bundle is not None:
+            source, bundle = self.bundle
+            if not is_current_source(source):
+                source, bundle = self.bundle = self.render_static()
+        else:
+            entries = []
+            for var in self.entries:
+                value = var if isinstance(var, str) else var.resolve(context)
+                if isinstance(value, (list, tuple)):
+                    entries += value
+                else:
+                    entries.append(value)
+            attributes = {
+                name: val.resolve(context) if not isinstance(val, str) else val
+                for name, val in self.attributes.items()
+            }
+            bundle = get_bundle(entries, attributes)
+
+        state = context.render_context.dicts[0]
+        bundles = state.get(BUNDLES_KEY)
+        if bundles is None:
+            bundles = state[BUNDLES_KEY] = []
+        bundles.append(bundle)
+        return emit_template_assets(context, bundle.head_parts)
+
+
+class ViteScriptsNode(template.Node):
+    """Template node of `{% vite_scripts %}`, rendering the scripts kept by `{% vite_head %}`."""
+
+    def render(self, context: template.Context) -> str:
+        bundles = context.render_context.dicts[0].pop(BUNDLES_KEY, ())
+        return ''.join(emit_template_assets(context, bundle.script_parts) for bundle in bundles)
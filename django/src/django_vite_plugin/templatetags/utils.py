@@ -1,6 +1,16 @@
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Set, Tuple, Union
 from django import template
-from ..utils import CONFIG, get_from_manifest, get_html_dev, find_asset, make_attrs
+from ..cache import RENDER_CACHE
+from ..utils import (
+    CONFIG,
+    get_compiled_manifest,
+    get_parts_from_manifest,
+    get_html_dev,
+    find_asset,
+    make_attrs,
+    make_preload_attrs,
+    is_enabled,
+)
 import copy
 
 
@@ -8,18 +18,27 @@ def make_template_attrs(attrs: Dict[str, str]) -> Dict[str, str]:
     """Create template-specific attributes with proper copying and caching."""
     js_attrs = copy.copy(CONFIG['JS_ATTRS'])
     css_attrs = copy.copy(CONFIG['CSS_ATTRS'])
+    preload = CONFIG['MODULE_PRELOAD']
 
     for key, value in attrs.items():
+        # Not an HTML attribute, toggles the modulepreload links of the tag
+        if key == 'modulepreload':
+            preload = is_enabled(value)
+            continue
         js_attrs[key] = value
         css_attrs[key] = value
     
     return {
         'js': make_attrs(js_attrs),
-        'css': make_attrs(css_attrs)
+        'css': make_attrs(css_attrs),
+        'preload': make_preload_attrs(js_attrs) if preload else None
     }
 
-def parse_template_args(bits: List[str]) -> Tuple[List[Any], Dict[str, Any], bool, bool]:
-    """Parse template tag arguments into assets and attributes."""
+def parse_template_args(bits: List[str], find: bool = True) -> Tuple[List[Any], Dict[str, Any], bool, bool]:
+    """
+    Parse template tag arguments into assets and attributes
+    Literal paths are found unless `find` is False
+    """
     if not bits and CONFIG['DEV_MODE']:
         return [CONFIG['WS_CLIENT']], {}, False, False
     
@@ -42,11 +61,84 @@ def parse_template_args(bits: List[str]) -> Tuple[List[Any], Dict[str, Any], boo
                 has_dynamic_path = True
                 path = template.Variable(bit)
             else:
-                path = find_asset(bit[1:-1])
+                path = find_asset(bit[1:-1]) if find else bit[1:-1]
             assets.append(path)
     
     return assets, kwargs, has_dynamic_path, has_dynamic_attr
 
-def make_template_asset(asset: str, attrs: Dict[str, str]) -> str:
-    """Generate asset HTML based on mode."""
-    return get_html_dev(asset, attrs) if CONFIG['DEV_MODE'] else get_from_manifest(asset, attrs)
\ No newline at end of file
+# Key of the tags already emitted in the render context
+EMITTED_KEY = 'django_vite_plugin_emitted'
+
+
+def make_template_asset(asset: str, attrs: Dict[str, str]) -> Tuple[str, ...]:
+    """Generate the tags of an asset, one per file, based on mode."""
+    if CONFIG['DEV_MODE']:
+        return (get_html_dev(asset, attrs),)
+    return get_parts_from_manifest(asset, attrs)
+
+
+def get_attrs_key(attributes: Dict[str, Any]) -> Tuple[Tuple[str, type, Any], ...]:
+    """
+    Get the cache key of attributes resolved while rendering
+    Values are keyed with their type, `True`, `1` and `1.0` are equal but
+    render differently
+    """
+    return tuple((name, type(value), value) for name, value in attributes.items())
+
+
+def get_template_parts(
+    assets: Tuple[Tuple[Any, bool], ...],
+    attrs_key: Tuple[Any, ...],
+    attributes: Union[Dict[str, Any], None] = None,
+    attrs: Union[Dict[str, str], None] = None
+) -> Tuple[str, ...]:
+    """
+    Get the tags of assets resolved while rendering, cached by their values
+    Each asset comes with whether it still has to be found, the attributes
+    are compiled from `attributes` unless `attrs` is given
+    """
+    manifest = get_compiled_manifest()
+    key = (assets, attrs_key)
+    try:
+        cached = RENDER_CACHE.get(key)
+    except TypeError:
+        # A variable resolved to a value that cannot be a key
+        key = cached = None
+    if cached is not None and cached[0] is manifest:
+        return cached[1]
+
+    if attrs is None:
+        attrs = make_template_attrs(attributes)
+    parts = ()
+    for asset, is_variable in assets:
+        parts += make_template_asset(find_asset(asset) if is_variable else asset, attrs)
+    if key is not None:
+        RENDER_CACHE.set(key, (manifest, parts))
+    return parts
+
+
+def emit_template_assets(context: template.Context, parts: Tuple[str, ...]) -> str:
+    """
+    Join the tags of the assets, leaving out the ones already emitted while
+    rendering the same template, its parents or included templates
+    """
+    if not CONFIG['DEDUPLICATE']:
+        return ''.join(parts)
+
+    # Included templates push their own state on the render context, only
+    # its first dict lives as long as the whole render
+    state = context.render_context.dicts[0]
+    emitted = state.get(EMITTED_KEY)
+    if emitted is None:
+        emitted = state[EMITTED_KEY] = set()
+    return join_new_parts(emitted, parts)
+
+
+def join_new_parts(emitted: Set[str], parts: Tuple[str, ...]) -> str:
+    """Join the tags that are not in `emitted`, adding them to it."""
+    html = ''
+    for part in parts:
+        if part not in emitted:
+            emitted.add(part)
+            html += part
+    return html
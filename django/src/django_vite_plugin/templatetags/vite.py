@@ -1,6 +1,8 @@
 from typing import List
 from django import template
-from .nodes import ViteAssetNode
+from ..offline import get_tag_key
+from ..utils import get_offline_tags
+from .nodes import ViteAssetNode, ViteHeadNode, ViteScriptsNode
 from .utils import parse_template_args
 
 register = template.Library()
@@ -8,7 +10,16 @@ register = template.Library()
 @register.tag()
 def vite(_, token):
     """Template tag for rendering Vite assets."""
-    bits: List[str] = token.split_contents()[1:]
+    bits: List[str] = token.split_contents()
+
+    # Use the tags rendered at deploy time, if any, finding nothing
+    offline = get_offline_tags()
+    if offline is not None:
+        parts = offline.get(get_tag_key(bits))
+        if parts is not None:
+            return ViteAssetNode.from_offline(bits[1:], offline, parts)
+
+    bits = bits[1:]
     assets, kwargs, has_dynamic_path, has_dynamic_attr = parse_template_args(bits)
     
     return ViteAssetNode(
@@ -17,3 +28,24 @@ def vite(_, token):
         has_dynamic_attr=has_dynamic_attr,
         has_dynamic_path=has_dynamic_path
     )
+
+
+@register.tag()
+def vite_head(_, token):
+    """Template tag for rendering the stylesheets and preloads of Vite entries."""
+    bits: List[str] = token.split_contents()
+    entries, kwargs, has_dynamic_path, has_dynamic_attr = parse_template_args(bits[1:], find=False)
+    return ViteHeadNode(
+        entries=entries,
+        attributes=kwargs,
+        is_static=not has_dynamic_path and not has_dynamic_attr
+    )
+
+
+@register.tag()
+def vite_scripts(_, token):
+    """Template tag for rendering the scripts of the entries of `{% vite_head %}`."""
+    bits: List[str] = token.split_contents()
+    if len(bits) > 1:
+        raise template.TemplateSyntaxError(f"'{bits[0]}' takes no arguments")
+    return ViteScriptsNode()
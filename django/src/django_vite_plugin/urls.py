@@ -1,10 +1,17 @@
 from django.conf import settings
 from django.conf.urls.static import static
+from django.urls import path
 from .config_helper import get_config
+from . import views
 
 CONFIG = get_config()
 
 urlpatterns = []
 
 if not CONFIG['DEV_MODE']:
-    urlpatterns = static(CONFIG['BUILD_URL_PREFIX'].strip('/'), document_root=settings.BASE_DIR / CONFIG['BUILD_DIR'])
\ No newline at end of file
+    urlpatterns = static(CONFIG['BUILD_URL_PREFIX'].strip('/'), document_root=settings.BASE_DIR / CONFIG['BUILD_DIR'])
+else:
+    urlpatterns = [
+        path('__django_vite_plugin__/ready/', views.ready, name='django_vite_plugin_ready'),
+        path('__django_vite_plugin__/templates/', views.rendered_templates, name='django_vite_plugin_templates'),
+    ]
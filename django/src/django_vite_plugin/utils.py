@@ -1,11 +1,34 @@
-from typing import Dict
+import sys
+import threading
+import time
+from typing import Dict, Tuple, Union
 from django.conf import settings
-from django.contrib.staticfiles import finders
-from urllib.parse import urljoin
+from django.template import TemplateDoesNotExist, TemplateSyntaxError
 from .config_helper import get_config
 from .constants import ROOT_DIR_LEN
-from .cache import FOUND_FILES_CACHE, VITE_MANIFEST, DEV_SERVER
-from .manifest import get_manifest_entry, load_manifest
+from . import cache
+from .cache import FOUND_FILES_CACHE, RENDER_CACHE
+from .manifest import (
+    get_manifest_hash,
+    get_manifest_signature,
+    hash_manifest,
+    parse_manifest,
+    read_manifest_file,
+)
+from .compiler import (
+    CompiledManifest,
+    compile_manifest,
+    get_compiled_path,
+    load_compiled_manifest,
+    save_compiled_manifest,
+)
+from .offline import (
+    OfflineTags,
+    get_config_key,
+    get_offline_path,
+    load_offline_tags,
+    save_offline_tags,
+)
 from .html import get_html
 
 # Length of the root directory
@@ -13,17 +36,9 @@ ROOT_DIR_LEN = len(str(getattr(settings, "BASE_DIR")))
 
 CONFIG = get_config()
 
-# Ensure BUILD_URL_PREFIX ends with '/'
-if not CONFIG['BUILD_URL_PREFIX'].endswith('/'):
-    CONFIG['BUILD_URL_PREFIX'] += '/'
+FOUND_FILES_CACHE.maxsize = CONFIG['STATIC_LOOKUP_CACHE_SIZE']
 
-# Set JS attributes for build mode
-if CONFIG['DEV_MODE'] is False and 'JS_ATTRS_BUILD' in CONFIG:
-    CONFIG['JS_ATTRS'] = CONFIG['JS_ATTRS_BUILD']
-
-if not CONFIG['DEV_MODE']:
-    manifest_path = CONFIG['MANIFEST']
-    load_manifest(manifest_path)
+RENDER_CACHE.maxsize = CONFIG['RENDER_CACHE_SIZE']
 
 
 def make_attrs(attrs: Dict[str, any]):
@@ -44,54 +59,269 @@ def make_attrs(attrs: Dict[str, any]):
 
 
 
+def make_preload_attrs(js_attrs: Dict[str, any]) -> str:
+    """
+    Compile the attributes of the modulepreload links of a script
+    They must share the CORS mode of the script to be reused
+    """
+    attrs = {'rel': 'modulepreload'}
+    if 'crossorigin' in js_attrs:
+        attrs['crossorigin'] = js_attrs['crossorigin']
+    return make_attrs(attrs)
+
+
+def make_link_params(attrs: Dict[str, any]) -> str:
+    """
+    Compile the CORS mode of tags as the params of their `Link` headers
+    Preloads must share it with the tags to be reused
+    """
+    if 'crossorigin' not in attrs:
+        return ''
+    value = attrs['crossorigin']
+    if value is True or value == '':
+        return '; crossorigin'
+    return f'; crossorigin={value}'
+
+
+def is_enabled(value: any) -> bool:
+    """Check a flag that may come as a template string, e.g. 'false'."""
+    if isinstance(value, str):
+        return value.lower() not in ('', '0', 'false', 'no', 'off')
+    return bool(value)
+
+
 # Compile the default css attributes beforehand
 DEFAULT_CSS_ATTRS = make_attrs(CONFIG['CSS_ATTRS'])
 
+# Attributes used by the tags that do not specify any
+DEFAULT_ATTRS = {
+    'js': make_attrs(CONFIG['JS_ATTRS']),
+    'css': DEFAULT_CSS_ATTRS,
+    'preload': make_preload_attrs(CONFIG['JS_ATTRS']) if CONFIG['MODULE_PRELOAD'] else None
+}
+
+
+# Params of the `Link` headers of stylesheets and scripts
+LINK_PARAMS = {
+    'js': make_link_params(CONFIG['JS_ATTRS']),
+    'css': make_link_params(CONFIG['CSS_ATTRS']),
+}
+
+
+def _compile_manifest(use_compiled: bool = True) -> CompiledManifest:
+    manifest_path = CONFIG['MANIFEST']
+    # The signature is the one of the file read, which a build may replace
+    # or remove at any time
+    signature, content = read_manifest_file(manifest_path)
+    source_hash = hash_manifest(content)
+    compiled = None
+
+    # Prefer the output of `django_vite_plugin --action compile`
+    if use_compiled and source_hash is not None:
+        compiled = load_compiled_manifest(
+            get_compiled_path(manifest_path),
+            source_hash,
+            CONFIG['BUILD_URL_PREFIX'],
+            DEFAULT_CSS_ATTRS,
+            DEFAULT_ATTRS
+        )
+
+    if compiled is None:
+        compiled = compile_manifest(
+            parse_manifest(manifest_path, content),
+            CONFIG['BUILD_URL_PREFIX'],
+            DEFAULT_CSS_ATTRS,
+            DEFAULT_ATTRS
+        )
+        compiled.source_hash = source_hash
+
+    compiled.signature = signature
+    return compiled
+
+
+def _set_compiled_manifest(compiled: CompiledManifest) -> None:
+    global COMPILED_MANIFEST
+    # Rebinding is atomic, a render sees either the old or the new manifest
+    COMPILED_MANIFEST = compiled
+
+
+# Loaded on first use, see `get_compiled_manifest`
+COMPILED_MANIFEST = None
+
+# Serializes loads and reloads of the manifest
+RELOAD_LOCK = threading.Lock()
+
+# When the manifest file should be checked for changes next
+NEXT_MANIFEST_CHECK = 0.0
+
+
+def reload_manifest() -> CompiledManifest:
+    """
+    Load the manifest again and swap it in with everything derived from it
+    The loaded manifest is kept if the file cannot be read
+    """
+    with RELOAD_LOCK:
+        compiled = _compile_manifest()
+        if compiled.signature is None and COMPILED_MANIFEST is not None:
+            return COMPILED_MANIFEST
+        _set_compiled_manifest(compiled)
+    return compiled
+
+
+def write_compiled_manifest() -> str:
+    """Compile the manifest from scratch and save it next to the manifest."""
+    compiled = _compile_manifest(use_compiled=False)
+    path = get_compiled_path(CONFIG['MANIFEST'])
+    save_compiled_manifest(compiled, path)
+    return str(path)
+
+
+def _reload_changed_manifest() -> None:
+    try:
+        compiled = _compile_manifest()
+        # The file may be gone again while a build is in progress, the old
+        # manifest is kept until the new one can be read
+        if compiled.signature is not None:
+            _set_compiled_manifest(compiled)
+    except Exception as error:
+        sys.stderr.write(f"{error}\n")
+    finally:
+        RELOAD_LOCK.release()
+
+
+def get_compiled_manifest() -> CompiledManifest:
+    """
+    Get the compiled manifest, loading it on the first call
+    When `MANIFEST_WATCH_INTERVAL` is set, the manifest file is checked for
+    changes at most once per interval and reloaded in a background thread
+    """
+    global NEXT_MANIFEST_CHECK
+    compiled = COMPILED_MANIFEST
+    if compiled is None:
+        if CONFIG['DEV_MODE']:
+            return None
+        with RELOAD_LOCK:
+            if COMPILED_MANIFEST is None:
+                _set_compiled_manifest(_compile_manifest())
+            compiled = COMPILED_MANIFEST
+
+    interval = CONFIG['MANIFEST_WATCH_INTERVAL']
+    if interval is None:
+        return compiled
+
+    now = time.monotonic()
+    if now < NEXT_MANIFEST_CHECK:
+        return compiled
+    NEXT_MANIFEST_CHECK = now + interval
+
+    signature = get_manifest_signature(CONFIG['MANIFEST'])
+    if signature is None or signature == compiled.signature:
+        return compiled
+
+    if RELOAD_LOCK.acquire(blocking=False):
+        threading.Thread(target=_reload_changed_manifest, daemon=True).start()
+    return compiled
+
+
+# Loaded on first use, False if there are none, see `get_offline_tags`
+OFFLINE_TAGS = None
+
+
+def get_offline_tags() -> Union[OfflineTags, None]:
+    """
+    Get the tags prerendered by `django_vite_plugin --action prerender`
+    Returns None in DEV_MODE or if they do not match the manifest
+    """
+    global OFFLINE_TAGS
+    if CONFIG['DEV_MODE']:
+        return None
+    if OFFLINE_TAGS is None:
+        with RELOAD_LOCK:
+            if OFFLINE_TAGS is None:
+                manifest_path = CONFIG['MANIFEST']
+                source_hash = get_manifest_hash(manifest_path)
+                offline = None
+                if source_hash is not None:
+                    offline = load_offline_tags(
+                        get_offline_path(manifest_path),
+                        source_hash,
+                        get_config_key(CONFIG)
+                    )
+                OFFLINE_TAGS = offline or False
+    return OFFLINE_TAGS or None
+
+
+def is_current_source(source: Union[CompiledManifest, OfflineTags]) -> bool:
+    """Check that tags rendered from `source` are still valid for the manifest in use."""
+    if isinstance(source, OfflineTags):
+        # The manifest does not change unless it is watched
+        if CONFIG['MANIFEST_WATCH_INTERVAL'] is None:
+            return True
+        compiled = get_compiled_manifest()
+        return compiled is not None and compiled.source_hash == source.source_hash
+    return source is get_compiled_manifest()
+
+
+def write_offline_tags(tags: Dict[str, Tuple[str, ...]]) -> str:
+    """Save tags rendered from the current manifest next to the manifest."""
+    compiled = get_compiled_manifest()
+    path = get_offline_path(CONFIG['MANIFEST'])
+    save_offline_tags(OfflineTags(compiled.source_hash, tags), get_config_key(CONFIG), path)
+    return str(path)
+
+
+def warmup() -> None:
+    """
+    Do the work otherwise left to the first requests of every worker:
+    resolve the whole manifest and compile the templates using `{% vite %}`,
+    which finds their assets and renders their static tags
+    """
+    from .scanner import find_vite_tags
+
+    # Loading a missing manifest would keep it empty for the whole process
+    if not CONFIG['DEV_MODE'] and get_manifest_signature(CONFIG['MANIFEST']) is None:
+        sys.stderr.write(f"Cannot warm up, the Vite manifest {CONFIG['MANIFEST']} does not exist\n")
+        return
+
+    compiled = get_compiled_manifest()
+    if compiled is not None:
+        compiled.graph.closures()
+
+    for engine, name, _ in find_vite_tags():
+        try:
+            engine.get_template(name)
+        except (TemplateDoesNotExist, TemplateSyntaxError) as error:
+            sys.stderr.write(f"Cannot warm up template {name}: {error}\n")
+
 
 def get_from_manifest(path: str, attrs: Dict[str, str]) -> str:
     """Get assets from manifest for a given path."""
     if path == 'react':
         return ''
-    manifest_entry = get_manifest_entry(path)
-    assets = _get_css_files(manifest_entry, {
-        'css': DEFAULT_CSS_ATTRS
-    })
-    assets += get_html(
-        urljoin(CONFIG['BUILD_URL_PREFIX'], manifest_entry["file"]),
-        attrs
-    )
-    return assets
-
+    return ''.join(get_compiled_manifest().render_parts(path, attrs))
 
 
-def _get_css_files(
-    manifest_entry: Dict[str, str],
-    attrs: Dict[str, str],
-    already_processed = None
-) -> str:
-    if already_processed is None:
-        already_processed = []
-    html = ''
-
-    if 'imports' in manifest_entry:
-        for import_path in manifest_entry['imports']:
-            html += _get_css_files(
-                VITE_MANIFEST[import_path],
-                attrs,
-                already_processed
-            )
+def get_parts_from_manifest(path: str, attrs: Dict[str, str]) -> Tuple[str, ...]:
+    """Get the tags of the assets of a given path, one per file."""
+    if path == 'react':
+        return ()
+    return get_compiled_manifest().render_parts(path, attrs)
 
-    if 'css' in manifest_entry:
-        for css_path in manifest_entry['css']:
-            if css_path not in already_processed:
-                html += get_html(
-                    urljoin(CONFIG['BUILD_URL_PREFIX'], css_path),
-                    attrs
-                )
-            already_processed.append(css_path)
 
-    return html
 
+def get_preload_links(entries: Tuple[str, ...]) -> Tuple[str, ...]:
+    """
+    Get the values of the `Link` headers preloading the given entries
+    Nothing is preloaded in development
+    """
+    compiled = get_compiled_manifest()
+    if compiled is None:
+        return ()
+    return compiled.get_links(
+        tuple(find_asset(entry) for entry in entries if entry != 'react'),
+        LINK_PARAMS['css'],
+        LINK_PARAMS['js']
+    )
 
 
 def get_html(url: str, attrs: Dict[str, str]) -> str:
@@ -101,20 +331,33 @@ def get_html(url: str, attrs: Dict[str, str]) -> str:
         return f'<script {attrs["js"]} src="{url}"></script>'
     
 
+# Serializes the first read of the hot file
+DEV_SERVER_LOCK = threading.Lock()
+
+
+def get_dev_server() -> str:
+    """Get the URL of the Vite dev server, read from the hot file on the first call."""
+    server = cache.DEV_SERVER
+    if server is None:
+        with DEV_SERVER_LOCK:
+            if cache.DEV_SERVER is None:
+                try:
+                    with open(CONFIG['HOT_FILE'], 'r') as hotfile:
+                        cache.DEV_SERVER = hotfile.read()
+                except OSError:
+                    raise Exception("Vite dev server is not started!")
+            server = cache.DEV_SERVER
+    return server
+
+
 def get_html_dev(url: str, attrs: Dict[str, str]) -> str:
-    global DEV_SERVER
-    if DEV_SERVER is None:
-        try:
-            with open(CONFIG['HOT_FILE'], 'r') as hotfile:
-                DEV_SERVER = hotfile.read()
-        except:
-            raise Exception("Vite dev server is not started!")
+    dev_server = get_dev_server()
     if url.endswith(('.css', '.scss', '.sass', '.less')):
-        return f'<link {attrs["css"]} href="{DEV_SERVER}/{url}" />'
+        return f'<link {attrs["css"]} href="{dev_server}/{url}" />'
     elif url == 'react':
         return f"""
         <script type="module">
-        import RefreshRuntime from "{DEV_SERVER}/@react-refresh"
+        import RefreshRuntime from "{dev_server}/@react-refresh"
         RefreshRuntime.injectIntoGlobalHook(window)
         window.$RefreshReg$ = () => {{}}
         window.$RefreshSig$ = () => (type) => type
@@ -122,22 +365,54 @@ def get_html_dev(url: str, attrs: Dict[str, str]) -> str:
         </script>
         """
     else:
-        return f'<script {attrs["js"]} src="{DEV_SERVER}/{url}"></script>'
+        return f'<script {attrs["js"]} src="{dev_server}/{url}"></script>'
     
 
 
 def find_asset(arg: str) -> str:
-    """Find asset using Django's static finder with caching."""
-    if arg in FOUND_FILES_CACHE:
-        return FOUND_FILES_CACHE[arg]
+    """
+    Find asset using Django's static finder with caching
+    Assets that are not found are cached too, with the path used instead
+    """
+    final = FOUND_FILES_CACHE.get(arg)
+    if final is not None:
+        return final
     
     if not CONFIG['STATIC_LOOKUP']:
         return arg
+
+    from .static_lookup import get_static_lookup
+    final = get_static_lookup().get(arg)
+    if final is not None:
+        FOUND_FILES_CACHE.set(arg, final)
+        return final
+
+    if CONFIG['STATIC_INDEX']:
+        from .static_index import get_static_index
+        found = get_static_index().find(arg)
+    else:
+        # Importing the finders is deferred to the first lookup
+        from django.contrib.staticfiles import finders
+        found = finders.find(arg, False)
+    final = _get_asset_path(found, arg)
     
-    found = finders.find(arg, False)
-    final = (found[ROOT_DIR_LEN:].strip('/\\').replace('\\', '/') 
-             if found is not None 
-             else arg.strip('/\\'))
-    
-    FOUND_FILES_CACHE[arg] = final
+    FOUND_FILES_CACHE.set(arg, final)
     return final
+
+
+def find_asset_uncached(arg: str) -> str:
+    """
+    Find asset using Django's static finders only, skipping every cache
+    For long lived processes asked about files that may have just been created
+    """
+    if not CONFIG['STATIC_LOOKUP']:
+        return arg
+    from django.contrib.staticfiles import finders
+    return _get_asset_path(finders.find(arg, False), arg)
+
+
+def _get_asset_path(found: Union[str, None], arg: str) -> str:
+    # Paths are relative to the root directory, the ones not found are kept
+    if found is None:
+        return arg.strip('/\\')
+    return found[ROOT_DIR_LEN:].strip('/\\').replace('\\', '/')
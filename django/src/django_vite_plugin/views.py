@@ -0,0 +1,26 @@
+import time
+from django.http import HttpRequest, JsonResponse
+
+# Changes every time the dev server restarts
+BOOT_ID = str(time.time_ns())
+
+
+def ready(request: HttpRequest) -> JsonResponse:
+    """
+    Readiness probe of the Vite reloader
+    A new `boot` tells it that Django restarted after a change
+    """
+    response = JsonResponse({'boot': BOOT_ID})
+    response['Cache-Control'] = 'no-store'
+    return response
+
+
+def rendered_templates(request: HttpRequest) -> JsonResponse:
+    """
+    Template files rendered by every page recently requested, so that the
+    Vite reloader only reloads the pages using a modified template
+    """
+    from .template_registry import get_rendered_templates
+    response = JsonResponse({'pages': get_rendered_templates()})
+    response['Cache-Control'] = 'no-store'
+    return response
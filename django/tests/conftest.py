@@ -0,0 +1,57 @@
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+import django
+from django.conf import settings
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+# Vite manifest of the tests, two entries sharing a chunk
+MANIFEST = {
+    '_shared.js': {
+        'file': 'assets/shared.js',
+    },
+    'app/main.js': {
+        'file': 'assets/main.js',
+        'src': 'app/main.js',
+        'isEntry': True,
+        'imports': ['_shared.js'],
+        'css': ['assets/main.css'],
+    },
+    'app/admin.js': {
+        'file': 'assets/admin.js',
+        'src': 'app/admin.js',
+        'isEntry': True,
+        'imports': ['_shared.js'],
+    },
+}
+
+
+def pytest_configure(config):
+    base_dir = Path(tempfile.mkdtemp(prefix='django_vite_plugin_tests_'))
+    manifest = base_dir / 'build' / '.vite' / 'manifest.json'
+    manifest.parent.mkdir(parents=True)
+    manifest.write_text(json.dumps(MANIFEST))
+
+    settings.configure(
+        BASE_DIR=base_dir,
+        DEBUG=False,
+        INSTALLED_APPS=['django.contrib.staticfiles', 'django_vite_plugin'],
+        STATIC_URL='/static/',
+        TEMPLATES=[{
+            'BACKEND': 'django.template.backends.django.DjangoTemplates',
+            'OPTIONS': {'builtins': ['django_vite_plugin.templatetags.vite']},
+        }],
+        DJANGO_VITE_PLUGIN={
+            'BUILD_DIR': base_dir / 'build',
+            'DEV_MODE': False,
+            # Assets are given by their manifest keys
+            'STATIC_LOOKUP': False,
+            'MODULE_PRELOAD': True,
+            # Small enough for the renders to evict each other
+            'RENDER_CACHE_SIZE': 4,
+        },
+    )
+    django.setup()
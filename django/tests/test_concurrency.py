@@ -0,0 +1,75 @@
+import re
+import threading
+import time
+from typing import Callable, Dict, List
+
+import pytest
+from django.template import engines
+
+THREADS = 16
+
+RENDERS = 200
+
+ENTRIES = ('app/main.js', 'app/admin.js')
+
+
+def run_threads(render: Callable[[str, str], str]) -> Dict[str, List[str]]:
+    """
+    Render from many threads at once, each with its own `crossorigin`
+    value, and get the outputs of each value
+    """
+    barrier = threading.Barrier(THREADS)
+    outputs: Dict[str, List[str]] = {}
+    errors = []
+
+    def work(index: int) -> None:
+        value = f'thread-{index}'
+        entry = ENTRIES[index % len(ENTRIES)]
+        rendered = outputs[value] = []
+        try:
+            barrier.wait()
+            for _ in range(RENDERS):
+                rendered.append(render(entry, value))
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=work, args=(index,)) for index in range(THREADS)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    assert not errors, errors
+    print(f'{THREADS * RENDERS / elapsed:.0f} renders/s with {THREADS} threads')
+    return outputs
+
+
+def check_outputs(outputs: Dict[str, List[str]]) -> None:
+    """Check that every render only has the attributes of its own thread."""
+    for value, rendered in outputs.items():
+        assert len(rendered) == RENDERS
+        for html in rendered:
+            assert set(re.findall(r'crossorigin="([^"]*)"', html)) == {value}
+            assert html.count('rel="modulepreload"') == 1
+            assert '/static/assets/shared.js' in html
+
+
+def test_django_tag_threads():
+    template = engines['django'].from_string(
+        '{% vite entry crossorigin=value %}'
+    )
+    outputs = run_threads(lambda entry, value: template.render({'entry': entry, 'value': value}))
+    check_outputs(outputs)
+
+
+def test_jinja2_tag_threads():
+    pytest.importorskip('jinja2')
+    from jinja2 import Environment
+
+    template = Environment(extensions=['django_vite_plugin.jinja.ViteExtension']).from_string(
+        '{% vite entry, crossorigin=value %}'
+    )
+    outputs = run_threads(lambda entry, value: template.render(entry=entry, value=value))
+    check_outputs(outputs)
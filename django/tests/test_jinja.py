@@ -0,0 +1,61 @@
+import pytest
+
+jinja2 = pytest.importorskip('jinja2')
+
+from jinja2.runtime import Context  # noqa: E402
+
+from django_vite_plugin.jinja import ViteExtension  # noqa: E402
+
+
+def make_environment(templates, **options):
+    return jinja2.Environment(
+        extensions=[ViteExtension],
+        loader=jinja2.DictLoader(templates),
+        **options
+    )
+
+
+def test_include_with_local_variables():
+    # The included template gets a copy of the variables of the page
+    environment = make_environment({
+        'page.html': "{% set title = 'x' %}{% include 'inc.html' %}{% vite 'app/main.js' %}",
+        'inc.html': "{% vite 'app/main.js' %}",
+    })
+    html = environment.get_template('page.html').render()
+    assert html.count('/static/assets/main.js') == 1
+    assert html.count('/static/assets/main.css') == 1
+
+
+def test_include_in_loop():
+    environment = make_environment({
+        'page.html': "{% for entry in entries %}{% include 'inc.html' %}{% endfor %}",
+        'inc.html': "{% vite entry %}",
+    })
+    html = environment.get_template('page.html').render(entries=['app/main.js', 'app/admin.js'])
+    assert html.count('/static/assets/shared.js') == 1
+    assert html.count('/static/assets/admin.js') == 1
+
+
+def test_renders_do_not_share_emitted_tags():
+    environment = make_environment({'page.html': "{% vite 'app/main.js' %}"})
+    template = environment.get_template('page.html')
+    assert template.render() == template.render()
+    assert '/static/assets/main.js' in template.render()
+
+
+def test_custom_context_class():
+    class CustomContext(Context):
+        pass
+
+    class CustomEnvironment(jinja2.Environment):
+        context_class = CustomContext
+
+    environment = CustomEnvironment(
+        extensions=[ViteExtension],
+        loader=jinja2.DictLoader({
+            'page.html': "{% set title = 'x' %}{% include 'inc.html' %}{% vite 'app/main.js' %}",
+            'inc.html': "{% vite 'app/main.js' %}",
+        })
+    )
+    assert issubclass(environment.context_class, CustomContext)
+    assert environment.get_template('page.html').render().count('/static/assets/main.js') == 1
@@ -0,0 +1,47 @@
+import os
+
+import pytest
+
+from django_vite_plugin import utils
+from django_vite_plugin.manifest import get_manifest_signature
+
+
+@pytest.fixture
+def manifest_path():
+    path = utils.CONFIG['MANIFEST']
+    utils.reload_manifest()
+    yield path
+    if not path.exists():
+        os.replace(f'{path}.moved', path)
+    utils.reload_manifest()
+
+
+def test_signature_of_the_file_read(manifest_path):
+    compiled = utils.reload_manifest()
+    assert compiled.signature == get_manifest_signature(manifest_path)
+    assert compiled.get_entry('app/main.js').file == 'assets/main.js'
+
+
+def test_missing_manifest_keeps_the_loaded_one(manifest_path):
+    # Like `emptyOutDir` at the start of a build
+    loaded = utils.get_compiled_manifest()
+    os.replace(manifest_path, f'{manifest_path}.moved')
+
+    assert utils.reload_manifest() is loaded
+
+    utils.RELOAD_LOCK.acquire()
+    utils._reload_changed_manifest()
+    assert utils.get_compiled_manifest() is loaded
+    assert not utils.RELOAD_LOCK.locked()
+
+
+def test_partial_manifest_keeps_the_loaded_one(manifest_path, capsys):
+    loaded = utils.get_compiled_manifest()
+    os.replace(manifest_path, f'{manifest_path}.moved')
+    manifest_path.write_text('{"app/main.js": {')
+
+    utils.RELOAD_LOCK.acquire()
+    utils._reload_changed_manifest()
+    assert utils.get_compiled_manifest() is loaded
+    assert 'Cannot read Vite manifest file' in capsys.readouterr().err
+    manifest_path.unlink()
@@ -1,9 +1,24 @@
 import fs from 'fs'
+import { performance } from 'perf_hooks'
 import { BuildOptions } from 'vite'
-import { glob } from 'glob'
 import { addStaticToInputs, createJsConfig } from './helpers.js'
 import { InputOption } from 'rollup'
 
+// Endpoints of `django_vite_plugin.urls` on the default runserver address
+const DEFAULT_READY_URL =
+    'http://127.0.0.1:8000/__django_vite_plugin__/ready/'
+const DEFAULT_TEMPLATES_URL =
+    'http://127.0.0.1:8000/__django_vite_plugin__/templates/'
+
+// Not watched by the reloader, nor by Vite
+export const WATCH_IGNORED = [
+    '**/__pycache__/**',
+    '**/migrations/**',
+    '**/venv/**',
+    '**/.venv/**',
+    '**/site-packages/**',
+]
+
 export interface AppConfig {
     WS_CLIENT: string
     DEV_MODE: boolean
@@ -18,6 +33,7 @@ export interface AppConfig {
     STATIC_LOOKUP: boolean
     INSTALLED_APPS: Record<string, string>
     HOT_FILE: string
+    CACHE_DIR: string
 }
 
 export interface PluginConfig {
@@ -45,12 +61,32 @@ export interface PluginConfig {
      */
     pyArgs?: Array<string>
 
+    /**
+     * Directory of the files shared with Django, the `CACHE_DIR` setting
+     * Defaults to `.django_vite_plugin` in the root
+     */
+    cacheDir?: string
+
     /**
      * Full reload options
      */
     reloader?: boolean | ((file: string) => boolean)
     watch?: string[]
+    /**
+     * Longest time to wait for Django before reloading, in ms
+     */
     delay?: number
+    /**
+     * URL answering once Django is ready, served by `django_vite_plugin.urls`
+     * in DEV_MODE. With `false` the reload is sent after `delay`.
+     */
+    readyUrl?: string | false
+    /**
+     * URL listing the templates rendered by each page, served by
+     * `django_vite_plugin.urls` in DEV_MODE, so that a template change
+     * only reloads the pages using it. With `false` every page reloads.
+     */
+    templatesUrl?: string | false
 }
 
 export interface InternalConfig extends PluginConfig {
@@ -58,6 +94,12 @@ export interface InternalConfig extends PluginConfig {
      * Configuartion provided in project's `settings.py`
      */
     appConfig: AppConfig
+
+    /**
+     * Milliseconds spent finding the app directories to watch, undefined
+     * if `watch` was given
+     */
+    watchResolveTime?: number
 }
 
 export type DevServerUrl = `${'http' | 'https'}://${string}:${number}`
@@ -79,7 +121,7 @@ export async function resolvePluginConfig(
     ]
 
     if (appConfig.STATIC_LOOKUP) {
-        promises.push(addStaticToInputs(config.input, config))
+        promises.push(addStaticToInputs(config.input, config, appConfig))
     }
 
     const res = await Promise.all(promises)
@@ -89,6 +131,7 @@ export async function resolvePluginConfig(
 
     //@ts-expect-error no way to convert decleared types
     config.appConfig = appConfig
+    ;(config as InternalConfig).watchResolveTime = res[0]
 
     if (config.addAliases === true) {
         createJsConfig(config as InternalConfig)
@@ -113,32 +156,48 @@ export function resolveBuildConfig(
     }
 }
 
+/**
+ * Fills in the reloader options, returns the milliseconds spent finding
+ * the app directories to watch, if they were not given
+ */
 async function resolveFullReloadConfig(
     config: PluginConfig,
     apps: Record<string, string>,
-) {
+): Promise<number | undefined> {
     if (typeof config.reloader === 'undefined') {
         config.reloader = true
     } else if (!config.reloader) {
         config.watch = []
-        return
+        return undefined
     }
 
     if (typeof config.delay !== 'number') {
         config.delay = 3000
     }
 
+    if (typeof config.readyUrl === 'undefined') {
+        config.readyUrl = DEFAULT_READY_URL
+    }
+
+    if (typeof config.templatesUrl === 'undefined') {
+        config.templatesUrl = DEFAULT_TEMPLATES_URL
+    }
+
     if (Array.isArray(config.watch)) {
-        return
+        return undefined
     }
 
+    // The app directories are watched as a whole, so that files created
+    // later are watched too, with `WATCH_IGNORED` left out
+    const start = performance.now()
     const root = config.root || '.'
     const watch: string[] = []
 
     for (const app in apps) {
         if (fs.existsSync(root + '/' + app)) {
-            watch.push(`${root}/${app}/**/*.py`)
+            watch.push(`${root}/${app}`)
         }
     }
-    config.watch = glob.globSync(watch)
+    config.watch = watch
+    return performance.now() - start
 }
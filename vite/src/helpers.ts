@@ -1,4 +1,4 @@
-import { spawn } from 'child_process'
+import { ChildProcessWithoutNullStreams, spawn } from 'child_process'
 import fs from 'fs'
 import path from 'path'
 import { ResolvedConfig, UserConfig, normalizePath } from 'vite'
@@ -32,17 +32,52 @@ export const BASE_DIR: string = path.dirname(
     ),
 )
 
+/**
+ * How the plugin starts Python, recorded by Django in the files it writes
+ * for the next runs, which must not use files written with other settings
+ */
+function pluginArgs(config: PluginConfig): string {
+    return JSON.stringify({
+        pyArgs: config.pyArgs || [],
+        settingsModule: process.env.DJANGO_SETTINGS_MODULE ?? null,
+    })
+}
+
+function pythonEnv(config: PluginConfig): NodeJS.ProcessEnv {
+    return { ...process.env, DJANGO_VITE_PLUGIN_ARGS: pluginArgs(config) }
+}
+
+/**
+ * Gets the settings module Django will use, when the plugin can tell
+ */
+function settingsModule(config: PluginConfig): string | undefined {
+    const args = config.pyArgs || []
+    for (let i = 0; i < args.length; i++) {
+        if (args[i].startsWith('--settings=')) {
+            return args[i].slice('--settings='.length)
+        }
+        if (args[i] === '--settings') {
+            return args[i + 1]
+        }
+    }
+    return process.env.DJANGO_SETTINGS_MODULE
+}
+
 export function execPythonNoErr(
     args: string[],
     config: PluginConfig,
 ): Promise<[string, string]> {
     return new Promise((resolve) => {
         args = [...(args || []), ...(config.pyArgs || [])]
-        const py = spawn(config.pyPath || 'python', [
-            path.join(config.root || '', 'manage.py'),
-            'django_vite_plugin',
-            ...args,
-        ])
+        const py = spawn(
+            config.pyPath || 'python',
+            [
+                path.join(config.root || '', 'manage.py'),
+                'django_vite_plugin',
+                ...args,
+            ],
+            { env: pythonEnv(config) },
+        )
 
         let err = '',
             res = ''
@@ -74,6 +109,143 @@ export async function execPythonJSON(
     }
 }
 
+/**
+ * Long lived `django_vite_plugin --serve-stdio` process
+ * Django is set up once and answers every request of the plugin
+ */
+class PythonServer {
+    readonly key: string
+    closed = false
+    private py: ChildProcessWithoutNullStreams
+    private nextId = 1
+    private pending = new Map<
+        number,
+        { resolve: (value: any) => void; reject: (reason: Error) => void }
+    >()
+    private stdout = ''
+    private stderr = ''
+
+    constructor(config: PluginConfig) {
+        this.key = serverKey(config)
+        this.py = spawn(
+            config.pyPath || 'python',
+            [
+                path.join(config.root || '', 'manage.py'),
+                'django_vite_plugin',
+                '--serve-stdio',
+                ...(config.pyArgs || []),
+            ],
+            { env: pythonEnv(config) },
+        )
+        this.py.stdout.on('data', (data) => this.onData(data.toString()))
+        this.py.stderr.on('data', (data) => {
+            this.stderr += data.toString()
+        })
+        this.py.on('error', (error) => this.close(error))
+        this.py.on('close', () =>
+            this.close(new Error(this.stderr || 'Python process exited')),
+        )
+        process.on('exit', () => this.py.kill())
+        this.setRef(false)
+    }
+
+    request(method: string, params: any = {}): Promise<any> {
+        const id = this.nextId++
+        return new Promise((resolve, reject) => {
+            this.pending.set(id, { resolve, reject })
+            this.setRef(true)
+            this.py.stdin.write(
+                JSON.stringify({ jsonrpc: '2.0', id, method, params }) + '\n',
+            )
+        })
+    }
+
+    kill() {
+        this.py.kill()
+    }
+
+    private onData(data: string) {
+        this.stdout += data
+        let end: number
+        while ((end = this.stdout.indexOf('\n')) !== -1) {
+            const line = this.stdout.substring(0, end)
+            this.stdout = this.stdout.substring(end + 1)
+            let response: any
+            try {
+                response = JSON.parse(line)
+            } catch {
+                // Something else printed to stdout, e.g. in settings.py
+                continue
+            }
+            const request = this.pending.get(response?.id)
+            if (!request) {
+                continue
+            }
+            this.pending.delete(response.id)
+            if (response.error) {
+                request.reject(new Error(response.error.message))
+            } else {
+                request.resolve(response.result)
+            }
+        }
+        this.setRef(this.pending.size > 0)
+    }
+
+    private close(error: Error) {
+        this.closed = true
+        for (const request of this.pending.values()) {
+            request.reject(error)
+        }
+        this.pending.clear()
+    }
+
+    /**
+     * The process must not keep Vite alive once nothing waits for it,
+     * e.g. at the end of a build
+     */
+    private setRef(ref: boolean) {
+        const handles: any[] = [
+            this.py,
+            this.py.stdin,
+            this.py.stdout,
+            this.py.stderr,
+        ]
+        for (const handle of handles) {
+            if (ref) {
+                handle.ref?.()
+            } else {
+                handle.unref?.()
+            }
+        }
+    }
+}
+
+function serverKey(config: PluginConfig): string {
+    return JSON.stringify([config.pyPath, config.root, pluginArgs(config)])
+}
+
+let pythonServer: PythonServer | undefined
+
+/**
+ * Sends a request to the Python process shared by every instance of
+ * the plugin, starting it on the first call
+ */
+export function requestPython(
+    method: string,
+    params: any,
+    config: PluginConfig,
+): Promise<any> {
+    if (
+        !pythonServer ||
+        pythonServer.closed ||
+        pythonServer.key !== serverKey(config)
+    ) {
+        pythonServer?.kill()
+        pythonServer = new PythonServer(config)
+    }
+    return pythonServer.request(method, params)
+}
+
 export function pluginVersion(): string {
     try {
         const packageJson = path.join(BASE_DIR, '/package.json')
@@ -83,6 +255,116 @@ export function pluginVersion(): string {
     }
 }
 
+function getMtime(file: string): string | null {
+    try {
+        // Nanoseconds, as written by Python
+        return fs.statSync(file, { bigint: true }).mtimeNs.toString()
+    } catch {
+        return null
+    }
+}
+
+/**
+ * Reads a file written by the Django side with the modification times
+ * of the files it depends on
+ * Returns undefined if one of them changed since, or if it was written
+ * with other settings or Python arguments
+ */
+function readArtifact(
+    file: string,
+    format: number,
+    config: PluginConfig,
+): any {
+    let data: any
+    try {
+        data = JSON.parse(fs.readFileSync(file, 'utf-8'))
+    } catch {
+        return undefined
+    }
+    if (data?.format !== format || !data.fingerprint) {
+        return undefined
+    }
+    // Files written by commands run by hand have no arguments, they match
+    // the default ones as the settings module is checked below
+    if (
+        data.plugin_args === null
+            ? (config.pyArgs || []).length > 0
+            : JSON.stringify(data.plugin_args) !== pluginArgs(config)
+    ) {
+        return undefined
+    }
+    const module = settingsModule(config)
+    if (module !== undefined && data.settings_module !== module) {
+        return undefined
+    }
+    for (const dep in data.fingerprint) {
+        if (getMtime(dep) !== data.fingerprint[dep]) {
+            return undefined
+        }
+    }
+    return data
+}
+
+export function getCacheDir(config: PluginConfig): string {
+    return (
+        config.cacheDir ?? path.join(config.root || '', '.django_vite_plugin')
+    )
+}
+
+/**
+ * Reads the static paths resolved by a previous run of the plugin
+ * Returns undefined if the static directories changed since
+ */
+export function readStaticLookup(
+    cacheDir: string,
+    config: PluginConfig,
+): Record<string, string> | undefined {
+    return readArtifact(path.join(cacheDir, 'static_lookup.json'), 1, config)
+        ?.paths
+}
+
+/**
+ * Reads the configuration sent by a previous run of the plugin
+ * Returns undefined if the settings or the installed apps changed since,
+ * or if it was written for other settings
+ */
+export function readConfigSnapshot(
+    cacheDir: string,
+    config: PluginConfig,
+): AppConfig | undefined {
+    return readArtifact(path.join(cacheDir, 'config.json'), 1, config)?.config
+}
+
+export function inputPaths(input: InputOption): string[] {
+    if (typeof input === 'string') {
+        return [input]
+    }
+    return Array.isArray(input) ? input : Object.values(input)
+}
+
+/**
+ * Gets the assets of the `{% vite %}` and `{% vite_head %}` tags of every template, from the
+ * snapshot of a previous run while the templates are unchanged
+ */
+export async function getTemplateEntries(
+    cacheDir: string,
+    config: PluginConfig,
+): Promise<string[]> {
+    const snapshot = readArtifact(
+        path.join(cacheDir, 'entries.json'),
+        1,
+        config,
+    )
+    if (snapshot?.entries) {
+        return snapshot.entries
+    }
+    try {
+        return await requestPython('entries', {}, config)
+    } catch {
+        return []
+    }
+}
+
 /**
  * Adds 'static' in file paths if already not exists
  */
@@ -90,6 +372,7 @@ export function pluginVersion(): string {
 export async function addStaticToInputs(
     input: InputOption,
     config: PluginConfig,
+    appConfig: AppConfig,
 ): Promise<string[] | Record<string, string>> {
     let inputs: string[] = []
     let isObj = false
@@ -102,10 +385,16 @@ export async function addStaticToInputs(
         inputs = input
     }
 
-    const res = await execPythonJSON(
-        ['--find-static', ...inputs.map((f) => normalizePath(f))],
-        config,
-    )
+    const normalized = inputs.map((f) => normalizePath(f))
+    const lookup = appConfig.CACHE_DIR
+        ? readStaticLookup(appConfig.CACHE_DIR, config)
+        : undefined
+
+    // Python is only spawned when some inputs were never resolved
+    const res =
+        lookup && normalized.every((f) => f in lookup)
+            ? normalized.map((f) => lookup[f])
+            : await requestPython('find_static', { assets: normalized }, config)
 
     if (isObj) {
         const resObj: Record<string, string> = {}
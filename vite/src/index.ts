@@ -1,11 +1,23 @@
 import fs from 'fs'
 import { AddressInfo } from 'net'
 import path from 'path'
+import { performance } from 'perf_hooks'
 import colors from 'picocolors'
-import { Plugin, UserConfig, ResolvedConfig } from 'vite'
+import {
+    Logger,
+    Plugin,
+    UserConfig,
+    ResolvedConfig,
+    WebSocketServer,
+    normalizePath,
+} from 'vite'
 import {
     pluginVersion,
-    execPythonJSON,
+    requestPython,
+    readConfigSnapshot,
+    getCacheDir,
+    getTemplateEntries,
+    inputPaths,
     writeAliases,
     getAppAliases,
     resolveDevServerUrl,
@@ -17,10 +29,14 @@ import {
     PluginConfig,
     resolveBuildConfig,
     resolvePluginConfig,
+    WATCH_IGNORED,
 } from './config.js'
 
 let DJANGO_VERSION = '...'
 
+// Interval between two readiness probes of the reloader
+const READY_POLL_INTERVAL = 100
+
 export async function djangoVitePlugin(
     config: PluginConfig | string | string[],
 ): Promise<Plugin[]> {
@@ -28,7 +44,10 @@ export async function djangoVitePlugin(
         config = { input: config }
     }
     process.stdout.write('Loading configurations...\r')
-    const appConfig = await execPythonJSON(['--action', 'config'], config)
+    // Python is not needed while the settings and the apps are unchanged
+    const appConfig =
+        readConfigSnapshot(getCacheDir(config), config) ??
+        (await requestPython('config', {}, config))
 
     if (DJANGO_VERSION === '...') {
         DJANGO_VERSION = appConfig.DJANGO_VERSION
@@ -61,15 +80,31 @@ function djangoPlugin(config: InternalConfig): Plugin {
     return {
         name: 'django-vite-plugin',
         enforce: 'pre',
-        config: (userConfig: UserConfig, { command }) => {
+        config: async (userConfig: UserConfig, { command }) => {
             const build = resolveBuildConfig(config, userConfig.build)
             userConfigG = userConfig
 
+            // Scan every entry used by the templates for dependencies up
+            // front, instead of optimizing them again on each page visit
+            const optimizeDeps =
+                command === 'serve' && !userConfig.optimizeDeps?.entries
+                    ? {
+                          entries: [
+                              ...inputPaths(config.input),
+                              ...(await getTemplateEntries(
+                                  config.appConfig.CACHE_DIR,
+                                  config,
+                              )),
+                          ],
+                      }
+                    : undefined
+
             return {
                 base:
                     command == 'build' ? config.appConfig.BUILD_URL_PREFIX : '',
                 root: userConfig.root || config.root || '.',
                 build,
+                optimizeDeps,
                 server: {
                     origin:
                         userConfig.server?.origin ??
@@ -164,6 +199,78 @@ function djangoPlugin(config: InternalConfig): Plugin {
     }
 }
 
+/**
+ * Asks Django for its boot id
+ * Returns '' if it answered without one and null if it did not answer
+ */
+async function probeDjango(url: string): Promise<string | null> {
+    try {
+        const res = await fetch(url, { signal: AbortSignal.timeout(1000) })
+        if (res.status >= 500) {
+            return null
+        }
+        try {
+            return String((await res.json()).boot ?? '')
+        } catch {
+            return ''
+        }
+    } catch {
+        return null
+    }
+}
+
+/**
+ * Finds the paths to send with `full-reload` so that only the pages that
+ * rendered one of `files` reload, from the templates recorded by Django
+ * Returns null if every page must reload
+ */
+async function findPagesToReload(
+    url: string,
+    files: string[],
+): Promise<string[] | null> {
+    let pages: Record<string, string[]>
+    try {
+        const res = await fetch(url, { signal: AbortSignal.timeout(1000) })
+        pages = (await res.json()).pages
+    } catch {
+        return null
+    }
+    if (!pages) {
+        return null
+    }
+
+    const changed = new Set(
+        files.map((file) => normalizePath(path.resolve(file))),
+    )
+    const found = new Set<string>()
+    const reload: string[] = []
+
+    for (const page in pages) {
+        const templates = pages[page]
+            .map((file) => normalizePath(path.resolve(file)))
+            .filter((file) => changed.has(file))
+        if (templates.length === 0) {
+            continue
+        }
+        templates.forEach((file) => found.add(file))
+        // The client only compares paths ending with `.html` to its location,
+        // and reloads every page for `/index.html`, so `/` cannot be told
+        // apart from the other pages
+        if (page === '/') {
+            return null
+        } else if (page.endsWith('/')) {
+            reload.push(page + 'index.html')
+        } else if (page.endsWith('.html')) {
+            reload.push(page)
+        } else {
+            return null
+        }
+    }
+
+    // A template no page is known to use may still be on screen
+    return found.size === changed.size ? reload : null
+}
+
 function fullReload(config: InternalConfig): Plugin {
     if (!config.reloader) {
         return {
@@ -175,28 +282,129 @@ function fullReload(config: InternalConfig): Plugin {
         reloader = (file: string) => /\.(html|py)$/.test(file)
     }
 
+    const readyUrl = config.readyUrl
+    const templatesUrl = config.templatesUrl
+    const delay = config.delay as number
+    let bootId: string | null = null
+    let waiting = false
+    let restart = false
+    const changed = new Set<string>()
+
+    /**
+     * Sends a single reload for every change made while waiting, once
+     * Django answers, and after it restarted if a Python file changed.
+     * `delay` is the longest it waits.
+     */
+    const scheduleReload = (ws: WebSocketServer, file: string) => {
+        restart = restart || file.endsWith('.py')
+        changed.add(file)
+        if (waiting) {
+            return
+        }
+        waiting = true
+        const start = Date.now()
+        const previous = bootId
+        let wentDown = false
+
+        const send = async () => {
+            const files = [...changed]
+            const everyPage = restart || !templatesUrl
+            changed.clear()
+            waiting = false
+            restart = false
+
+            const pages = everyPage
+                ? null
+                : await findPagesToReload(templatesUrl as string, files)
+            if (pages) {
+                pages.forEach((page) =>
+                    ws.send({ type: 'full-reload', path: page }),
+                )
+            } else {
+                ws.send({ type: 'full-reload', path: '*' })
+            }
+        }
+
+        if (!readyUrl) {
+            setTimeout(send, delay)
+            return
+        }
+
+        const check = async () => {
+            const id = await probeDjango(readyUrl)
+            if (id === null) {
+                wentDown = true
+            } else if (id) {
+                bootId = id
+            }
+            const restarted =
+                wentDown || (!!id && !!previous && id !== previous)
+            const ready = id !== null && (!restart || restarted)
+            if (ready || Date.now() - start >= delay) {
+                send()
+            } else {
+                setTimeout(check, READY_POLL_INTERVAL)
+            }
+        }
+        setTimeout(check, READY_POLL_INTERVAL)
+    }
+
     return {
         name: 'django-vite-plugin-reloader',
-        configureServer({ ws, watcher }) {
+        config: () => ({
+            server: {
+                watch: {
+                    ignored: WATCH_IGNORED,
+                },
+            },
+        }),
+        configureServer({ ws, watcher, config: { logger } }) {
+            if (readyUrl) {
+                probeDjango(readyUrl).then((id) => {
+                    bootId = id || bootId
+                })
+            }
             watcher.on('change', (file) => {
                 // @ts-ignore
                 if (reloader(file)) {
-                    setTimeout(
-                        () => ws.send({ type: 'full-reload', path: '*' }),
-                        config.delay,
-                    )
+                    scheduleReload(ws, file)
                 }
             })
             if (config.watch) {
-                config.watch.forEach((file) => {
-                    if (file.indexOf('__pycache__') >= 0) {
-                        return
-                    }
-                    watcher.add(file)
-                })
+                const start = performance.now()
+                watcher.add(config.watch)
+                logWatchTimes(
+                    logger,
+                    config.watch.length,
+                    config.watchResolveTime,
+                    performance.now() - start,
+                )
             }
         },
     }
 }
 
+/**
+ * Logs how long finding the watched paths and adding them to the watcher
+ * took, which delays the start of the dev server
+ */
+function logWatchTimes(
+    logger: Logger,
+    count: number,
+    resolveTime: number | undefined,
+    addTime: number,
+) {
+    const times = [`added in ${addTime.toFixed(1)}ms`]
+    if (resolveTime !== undefined) {
+        times.unshift(`found in ${resolveTime.toFixed(1)}ms`)
+    }
+    logger.info(
+        colors.dim(
+            `  django-vite-plugin: watching ${count} path${
+                count === 1 ? '' : 's'
+            }, ${times.join(', ')}`,
+        ),
+    )
+}
+
 export default djangoVitePlugin